@@ -10,8 +10,8 @@ import sys
 import os
 from pathlib import Path
 
-# Add the toolkit to Python path
-toolkit_path = Path(__file__).parent / "purple_team_toolkit"
+# Add the directory containing the purple_team_toolkit package to Python path
+toolkit_path = Path(__file__).parent
 sys.path.insert(0, str(toolkit_path))
 
 from purple_team_toolkit.cli.commands import main
@@ -10,9 +10,21 @@ __author__ = "mooncakesg"
 __description__ = "Purple Team cybersecurity toolkit for attack-defense correlation"
 
 from .cli import main
-from .purple_logic import PurpleTeamEngine
-from .red_team import RedTeamModule
-from .blue_team import BlueTeamModule
+
+# The engine and team modules pull in scanning and data-processing
+# dependencies, so they are only imported when first accessed.
+_LAZY_ATTRIBUTES = {
+    "PurpleTeamEngine": ".purple_logic",
+    "RedTeamModule": ".red_team",
+    "BlueTeamModule": ".blue_team",
+}
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        import importlib
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "main",
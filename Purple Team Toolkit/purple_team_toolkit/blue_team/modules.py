@@ -9,7 +9,7 @@ import json
 import time
 import logging
 import re
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Iterator
 from dataclasses import dataclass
 from pathlib import Path
 import threading
@@ -43,6 +43,17 @@ class DetectionRule:
     enabled: bool = True
     action: str = "alert"
 
+def _string_leaves(obj: Any) -> Iterator[str]:
+    """Yield every string value nested inside dicts, lists and tuples"""
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            yield from _string_leaves(value)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            yield from _string_leaves(value)
+
 class LogCollector:
     """Collects logs from various sources"""
     
@@ -308,6 +319,7 @@ class DetectionEngine:
         self.config = config
         self.logger = logging.getLogger(__name__)
         self.rules: List[DetectionRule] = []
+        self._compiled_patterns: Dict[str, re.Pattern] = {}
         self._load_default_rules()
     
     def _load_default_rules(self):
@@ -357,10 +369,21 @@ class DetectionEngine:
             )
         ]
         
+        for rule in default_rules:
+            self._compile_rule(rule)
         self.rules.extend(default_rules)
     
+    def _compile_rule(self, rule: DetectionRule) -> re.Pattern:
+        """Compile and cache the pattern of a detection rule"""
+        pattern = self._compiled_patterns.get(rule.pattern)
+        if pattern is None:
+            pattern = re.compile(rule.pattern, re.IGNORECASE)
+            self._compiled_patterns[rule.pattern] = pattern
+        return pattern
+    
     def add_rule(self, rule: DetectionRule):
         """Add a new detection rule"""
+        self._compile_rule(rule)
         self.rules.append(rule)
         self.logger.info(f"Added detection rule: {rule.name}")
     
@@ -401,20 +424,22 @@ class DetectionEngine:
     
     def _matches_rule(self, event: SecurityEvent, rule: DetectionRule) -> bool:
         """Check if an event matches a detection rule"""
+        search = self._compile_rule(rule).search
+        
         # Check description
-        if re.search(rule.pattern, event.description, re.IGNORECASE):
+        if search(event.description):
             return True
         
-        # Check raw data
-        raw_data_str = json.dumps(event.raw_data)
-        if re.search(rule.pattern, raw_data_str, re.IGNORECASE):
-            return True
+        # Check string values in raw data
+        for value in _string_leaves(event.raw_data):
+            if search(value):
+                return True
         
-        # Check normalized data
+        # Check string values in normalized data
         if event.normalized_data:
-            normalized_data_str = json.dumps(event.normalized_data)
-            if re.search(rule.pattern, normalized_data_str, re.IGNORECASE):
-                return True
+            for value in _string_leaves(event.normalized_data):
+                if search(value):
+                    return True
         
         return False
     
@@ -0,0 +1,141 @@
+"""
+Blue Team CLI Commands for Purple Team Toolkit
+"""
+
+import click
+from pathlib import Path
+from rich.panel import Panel
+from rich.text import Text
+from typing import Optional, List
+
+from .commands import get_console, _progress, _write_json, build_table
+
+SEVERITY_COLOR = {
+    'critical': 'red',
+    'high': 'yellow',
+    'medium': 'blue',
+    'low': 'green'
+}
+
+@click.group()
+def blue_team():
+    """Blue Team operations"""
+    pass
+
+@blue_team.command()
+@click.option('--source', '-s', multiple=True, help='Log sources to monitor')
+@click.option('--duration', '-d', type=int, default=300, help='Monitoring duration in seconds')
+@click.option('--output', '-o', type=click.Path(path_type=Path), help='Output file for alerts')
+@click.option('--pretty/--compact', default=False, help='Indent JSON output for reading')
+@click.pass_context
+def monitor(ctx, source: List[str], duration: int, output: Optional[Path], pretty: bool):
+    """Start security monitoring"""
+    
+    from ..blue_team import BlueTeamModule
+    
+    get_console().print(Panel.fit(
+        "[bold blue]Blue Team - Security Monitoring[/bold blue]",
+        border_style="blue"
+    ))
+    
+    config = ctx.obj['config']
+    blue_team = BlueTeamModule(config)
+    
+    sources = source if source else ['system_logs', 'network_logs', 'security_logs']
+    
+    with _progress() as progress:
+        
+        task = progress.add_task(f"Monitoring for {duration}s...", total=duration)
+        
+        try:
+            alerts = blue_team.log_collector.monitor_logs(sources, duration)
+            
+            progress.update(task, description="Monitoring completed!")
+            
+            # Display alerts
+            display_alerts(alerts)
+            
+            # Save alerts
+            if output:
+                _write_json(output, alerts, pretty)
+                get_console().print(f"[green]Alerts saved to: {output}[/green]")
+                
+        except Exception as e:
+            progress.update(task, description="Monitoring failed!")
+            get_console().print(f"[red]Error: {e}[/red]")
+
+@blue_team.command()
+@click.option('--query', '-q', required=True, help='Threat hunting query')
+@click.option('--timeframe', '-t', default='24h', help='Timeframe for hunting')
+@click.pass_context
+def hunt(ctx, query: str, timeframe: str):
+    """Perform threat hunting"""
+    
+    from ..blue_team import BlueTeamModule
+    
+    get_console().print(Panel.fit(
+        "[bold blue]Blue Team - Threat Hunting[/bold blue]",
+        border_style="blue"
+    ))
+    
+    config = ctx.obj['config']
+    blue_team = BlueTeamModule(config)
+    
+    with _progress() as progress:
+        
+        task = progress.add_task("Performing threat hunt...", total=None)
+        
+        try:
+            results = blue_team.detection_engine.threat_hunt(query, timeframe)
+            
+            progress.update(task, description="Threat hunt completed!")
+            display_hunt_results(results)
+                
+        except Exception as e:
+            progress.update(task, description="Threat hunt failed!")
+            get_console().print(f"[red]Error: {e}[/red]")
+
+def display_alerts(alerts: List[dict]):
+    """Display security alerts"""
+    
+    if not alerts:
+        get_console().print("[yellow]No alerts detected during monitoring period.[/yellow]")
+        return
+    
+    columns = (("Time", "cyan"), ("Severity", "white"), ("Source", "dim"), ("Description", "white"))
+    rows = [
+        (
+            alert.get('timestamp', 'Unknown'),
+            _severity_text(alert),
+            alert.get('source', 'Unknown'),
+            alert.get('description', 'No description')
+        )
+        for alert in alerts
+    ]
+    
+    get_console().print(build_table("Security Alerts", columns, rows))
+
+def _severity_text(alert: dict) -> Text:
+    """Colour an alert's severity for display"""
+    severity_color = SEVERITY_COLOR.get(alert.get('severity', 'medium'), 'white')
+    return Text(str(alert.get('severity', 'Unknown')), style=severity_color)
+
+def display_hunt_results(results: List[dict]):
+    """Display threat hunting results"""
+    
+    if not results:
+        get_console().print("[yellow]No threats found during hunt.[/yellow]")
+        return
+    
+    columns = (("Indicator", "cyan"), ("Type", "white"), ("Confidence", "dim"), ("Description", "white"))
+    rows = [
+        (
+            result.get('indicator', 'Unknown'),
+            result.get('type', 'Unknown'),
+            f"{result.get('confidence', 0)}%",
+            result.get('description', 'No description')
+        )
+        for result in results
+    ]
+    
+    get_console().print(build_table("Threat Hunting Results", columns, rows))
@@ -3,35 +3,208 @@ CLI Commands for Purple Team Toolkit
 """
 
 import click
-import yaml
+import hashlib
+import importlib
 import json
 import os
+import pickle
+import re
 import time
+from dataclasses import asdict, is_dataclass
 from pathlib import Path
-from rich.console import Console
+from concurrent.futures import ThreadPoolExecutor
 from rich.table import Table
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.tree import Tree
-from rich.live import Live
-from rich.layout import Layout
 from typing import Optional, List
 
-from ..purple_logic import PurpleTeamEngine
-from ..red_team import RedTeamModule
-from ..blue_team import BlueTeamModule
+from .. import __version__
 from ..config import Config
 
-console = Console()
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@click.group()
+_console = None
+
+def get_console():
+    """Return the shared Rich console, creating it on first use"""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+LATEST_RESULTS_POINTER = ".latest"
+
+# list_scenarios only needs these keys, which scenarios declare first
+SCENARIO_HEADER_KEYS = {'name', 'description', 'difficulty'}
+SCENARIO_HEADER_BYTES = 1024
+TOP_LEVEL_KEY_LINE = re.compile(rb'\n(?=[A-Za-z_"\'])')
+
+CACHE_DIR = Path.home() / ".cache" / "purple_team_toolkit"
+SCENARIO_CACHE_FILE = CACHE_DIR / "scenarios.json"
+
+def build_table(title: str, columns, rows) -> Table:
+    """Build a Rich table from (header, style) column pairs and pre-built row tuples"""
+    table = Table(title=title)
+    for header, style in columns:
+        table.add_column(header, style=style)
+    for row in rows:
+        table.add_row(*row)
+    return table
+
+def _progress():
+    """Create the spinner progress display shared by long-running commands"""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=get_console(),
+        transient=True
+    )
+
+def _read_scenario_header(scenario_file: Path) -> dict:
+    """Parse a scenario file, keeping only the fields shown by list_scenarios"""
+    with open(scenario_file, 'rb') as f:
+        data = f.read(SCENARIO_HEADER_BYTES)
+        scenario_data = _parse_scenario_prefix(data) if len(data) == SCENARIO_HEADER_BYTES else None
+        if scenario_data is None:
+            scenario_data = _load_yaml(data + f.read())
+    
+    return {
+        'name': scenario_data.get('name', scenario_file.stem),
+        'description': scenario_data.get('description', 'No description available'),
+        'difficulty': scenario_data.get('difficulty', 'Medium')
+    }
+
+def _parse_scenario_prefix(data: bytes) -> Optional[dict]:
+    """Parse the complete top-level entries at the start of a scenario file
+    
+    Returns None unless every header field was found, since a missing key
+    may still appear further down the file.
+    """
+    # Cut before the last line that starts a new top-level key; everything
+    # above it is made of complete entries
+    boundaries = [m.start() for m in TOP_LEVEL_KEY_LINE.finditer(data)]
+    if not boundaries:
+        return None
+    
+    try:
+        prefix_data = _load_yaml(data[:boundaries[-1] + 1])
+    except Exception:
+        return None
+    
+    if isinstance(prefix_data, dict) and SCENARIO_HEADER_KEYS <= prefix_data.keys():
+        return prefix_data
+    return None
+
+def _load_scenario_cache() -> dict:
+    """Load cached scenario headers keyed by resolved file path"""
+    try:
+        return json.loads(SCENARIO_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+def _save_scenario_cache(cache: dict):
+    """Persist scenario headers; the cache is best-effort"""
+    try:
+        SCENARIO_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        SCENARIO_CACHE_FILE.write_text(json.dumps(cache))
+    except OSError:
+        pass
+
+def _read_json(path) -> dict:
+    """Load a JSON file, parsing with orjson when it is installed"""
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _write_json(path, obj, pretty: bool = True):
+    """Write obj as JSON, serializing with orjson when it is installed"""
+    from ..purple_logic.correlation import _json_default
+    
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        Path(path).write_bytes(orjson.dumps(obj, option=option, default=_json_default))
+    else:
+        with open(path, 'w') as f:
+            if pretty:
+                f.write(json.dumps(obj, indent=2, default=_json_default))
+            else:
+                f.write(json.dumps(obj, separators=(',', ':'), default=_json_default))
+
+def _load_config(config_path: Path) -> Config:
+    """Load a configuration file, reusing a pickled copy while the file is unchanged"""
+    resolved = config_path.resolve()
+    stat = resolved.stat()
+    key = (__version__, pickle.HIGHEST_PROTOCOL, stat.st_mtime_ns, stat.st_size)
+    cache_file = CACHE_DIR / f"config-{hashlib.blake2b(str(resolved).encode()).hexdigest()[:16]}.pkl"
+    
+    try:
+        with open(cache_file, 'rb') as f:
+            cached = pickle.load(f)
+        if cached['key'] == key and isinstance(cached['config'], Config):
+            return cached['config']
+    except Exception:
+        pass
+    
+    config = Config.from_file(config_path)
+    
+    # Write the cache atomically so a concurrent reader never sees a partial file
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, 'wb') as f:
+            pickle.dump({'key': key, 'config': config}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except Exception:
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
+    
+    return config
+
+def _load_yaml(stream):
+    """Parse YAML with libyaml's CSafeLoader when PyYAML was built with it"""
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return yaml.load(stream, Loader=loader)
+
+class LazyGroup(click.Group):
+    """Click group that imports subcommands from other modules on first use"""
+    
+    def __init__(self, *args, lazy_subcommands: Optional[dict] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Maps command name -> (module path relative to this package, attribute)
+        self.lazy_subcommands = lazy_subcommands or {}
+    
+    def list_commands(self, ctx) -> List[str]:
+        return sorted(super().list_commands(ctx) + list(self.lazy_subcommands))
+    
+    def get_command(self, ctx, cmd_name: str):
+        if cmd_name in self.lazy_subcommands:
+            module_name, attribute = self.lazy_subcommands[cmd_name]
+            module = importlib.import_module(module_name, __package__)
+            return getattr(module, attribute)
+        return super().get_command(ctx, cmd_name)
+
+@click.group(cls=LazyGroup, lazy_subcommands={
+    'red-team': ('.red_team_commands', 'red_team'),
+    'blue-team': ('.blue_team_commands', 'blue_team'),
+})
 @click.version_option(version="1.0.0")
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
-@click.option('--config', '-c', type=click.Path(exists=True), help='Configuration file path')
+@click.option('--config', '-c', type=click.Path(exists=True, path_type=Path), help='Configuration file path')
 @click.option('--log-level', type=click.Choice(['DEBUG', 'INFO', 'WARNING', 'ERROR']), 
               default='INFO', help='Logging level')
 @click.pass_context
-def main(ctx, verbose: bool, config: Optional[str], log_level: str):
+def main(ctx, verbose: bool, config: Optional[Path], log_level: str):
     """Purple Team Toolkit - Attack-Defense Correlation Framework"""
     ctx.ensure_object(dict)
     ctx.obj['verbose'] = verbose
@@ -39,33 +212,35 @@ def main(ctx, verbose: bool, config: Optional[str], log_level: str):
     
     # Load configuration
     if config:
-        ctx.obj['config'] = Config.from_file(config)
+        ctx.obj['config'] = _load_config(config)
     else:
         ctx.obj['config'] = Config.default()
 
 @main.command()
-@click.option('--scenario', '-s', type=click.Path(exists=True), required=True, 
+@click.option('--scenario', '-s', type=click.Path(exists=True, path_type=Path), required=True, 
               help='Path to scenario configuration file')
 @click.option('--sandbox', is_flag=True, help='Enable sandbox mode for safe testing')
-@click.option('--output', '-o', type=click.Path(), help='Output directory for results')
+@click.option('--output', '-o', type=click.Path(path_type=Path), help='Output directory for results')
 @click.option('--timeout', type=int, default=3600, help='Scenario timeout in seconds')
 @click.option('--parallel', is_flag=True, help='Execute attacks in parallel')
+@click.option('--pretty/--compact', default=False, help='Indent JSON output for reading')
 @click.pass_context
-def run_scenario(ctx, scenario: str, sandbox: bool, output: Optional[str], 
-                timeout: int, parallel: bool):
+def run_scenario(ctx, scenario: Path, sandbox: bool, output: Optional[Path], 
+                timeout: int, parallel: bool, pretty: bool):
     """Execute a full attack and defense scenario"""
     
-    console.print(Panel.fit(
+    from ..purple_logic import PurpleTeamEngine, save_results
+    
+    get_console().print(Panel.fit(
         "[bold blue]Purple Team Toolkit - Scenario Execution[/bold blue]",
         border_style="blue"
     ))
     
     # Load scenario configuration
     try:
-        with open(scenario, 'r') as f:
-            scenario_config = yaml.safe_load(f)
+        scenario_config = _load_yaml(scenario.read_bytes())
     except Exception as e:
-        console.print(f"[red]Error loading scenario: {e}[/red]")
+        get_console().print(f"[red]Error loading scenario: {e}[/red]")
         return
     
     # Initialize Purple Team Engine
@@ -76,11 +251,7 @@ def run_scenario(ctx, scenario: str, sandbox: bool, output: Optional[str],
     engine = PurpleTeamEngine(config)
     
     # Execute scenario
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    with _progress() as progress:
         
         task = progress.add_task("Executing scenario...", total=None)
         
@@ -93,92 +264,89 @@ def run_scenario(ctx, scenario: str, sandbox: bool, output: Optional[str],
             
             # Save results
             if output:
-                output_path = Path(output)
-                output_path.mkdir(parents=True, exist_ok=True)
+                output.mkdir(parents=True, exist_ok=True)
+                
+                results_file = save_results(results, output / "scenario_results.json", pretty)
                 
-                results_file = output_path / "scenario_results.json"
-                with open(results_file, 'w') as f:
-                    json.dump(results, f, indent=2, default=str)
+                # Point report at these results without rescanning the directory
+                (output / LATEST_RESULTS_POINTER).write_text(results_file.name)
                 
-                console.print(f"[green]Results saved to: {results_file}[/green]")
+                get_console().print(f"[green]Results saved to: {results_file}[/green]")
             
             # Display summary
             display_scenario_summary(results, execution_time)
             
         except Exception as e:
             progress.update(task, description="Scenario failed!")
-            console.print(f"[red]Error executing scenario: {e}[/red]")
+            get_console().print(f"[red]Error executing scenario: {e}[/red]")
             if ctx.obj['verbose']:
                 raise
 
 @main.command()
 @click.option('--format', '-f', type=click.Choice(['json', 'csv', 'html', 'pdf']), 
               default='html', help='Output format')
-@click.option('--output', '-o', type=click.Path(), required=True, help='Output file path')
-@click.option('--scenario-results', type=click.Path(exists=True), 
+@click.option('--output', '-o', type=click.Path(path_type=Path), required=True, help='Output file path')
+@click.option('--scenario-results', type=click.Path(exists=True, path_type=Path), 
               help='Path to scenario results file')
-@click.option('--template', type=click.Path(exists=True), help='Custom report template')
+@click.option('--template', type=click.Path(exists=True, path_type=Path), help='Custom report template')
 @click.pass_context
-def report(ctx, format: str, output: str, scenario_results: Optional[str], template: Optional[str]):
+def report(ctx, format: str, output: Path, scenario_results: Optional[Path], template: Optional[Path]):
     """Generate scenario detection and coverage report"""
     
-    console.print(Panel.fit(
+    from ..purple_logic import PurpleTeamEngine
+    
+    get_console().print(Panel.fit(
         "[bold green]Purple Team Toolkit - Report Generation[/bold green]",
         border_style="green"
     ))
     
     # Load results
     if scenario_results:
-        with open(scenario_results, 'r') as f:
-            results = json.load(f)
+        results = _read_json(scenario_results)
     else:
         # Look for latest results
         results_dir = Path("reports")
-        if results_dir.exists():
+        pointer = results_dir / LATEST_RESULTS_POINTER
+        latest = results_dir / pointer.read_text().strip() if pointer.exists() else None
+        if latest is not None and latest.is_file():
+            results = _read_json(latest)
+        elif results_dir.exists():
             result_files = list(results_dir.glob("scenario_results.json"))
             if result_files:
                 latest = max(result_files, key=lambda x: x.stat().st_mtime)
-                with open(latest, 'r') as f:
-                    results = json.load(f)
+                results = _read_json(latest)
             else:
-                console.print("[red]No scenario results found. Run a scenario first.[/red]")
+                get_console().print("[red]No scenario results found. Run a scenario first.[/red]")
                 return
         else:
-            console.print("[red]No scenario results found. Run a scenario first.[/red]")
+            get_console().print("[red]No scenario results found. Run a scenario first.[/red]")
             return
     
     # Generate report
     config = ctx.obj['config']
     engine = PurpleTeamEngine(config)
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    with _progress() as progress:
         
         task = progress.add_task("Generating report...", total=None)
         
         try:
-            report_content = engine.generate_report(results, format, template)
+            if template is not None:
+                get_console().print("[yellow]Custom report templates are not supported yet; using the built-in template[/yellow]")
             
             # Save report
-            output_path = Path(output)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output.parent.mkdir(parents=True, exist_ok=True)
             
-            if format == 'json':
-                with open(output_path, 'w') as f:
-                    json.dump(report_content, f, indent=2, default=str)
-            else:
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(report_content)
+            # HTML and PDF reports are streamed into the file rather than built as one string
+            with open(output, 'w', encoding='utf-8') as f:
+                engine.generate_report(results, format, out=f)
             
             progress.update(task, description="Report generated successfully!")
-            console.print(f"[green]Report saved to: {output_path}[/green]")
+            get_console().print(f"[green]Report saved to: {output}[/green]")
             
         except Exception as e:
             progress.update(task, description="Report generation failed!")
-            console.print(f"[red]Error generating report: {e}[/red]")
+            get_console().print(f"[red]Error generating report: {e}[/red]")
             if ctx.obj['verbose']:
                 raise
 
@@ -187,14 +355,14 @@ def report(ctx, format: str, output: str, scenario_results: Optional[str], templ
 def list_scenarios(ctx):
     """List available predefined attack-defense scenarios"""
     
-    console.print(Panel.fit(
+    get_console().print(Panel.fit(
         "[bold yellow]Purple Team Toolkit - Available Scenarios[/bold yellow]",
         border_style="yellow"
     ))
     
     scenarios_dir = Path("configs/scenarios")
     if not scenarios_dir.exists():
-        console.print("[red]Scenarios directory not found.[/red]")
+        get_console().print("[red]Scenarios directory not found.[/red]")
         return
     
     table = Table(title="Available Scenarios")
@@ -205,196 +373,64 @@ def list_scenarios(ctx):
     
     scenario_files = list(scenarios_dir.glob("*.yaml")) + list(scenarios_dir.glob("*.yml"))
     
-    for scenario_file in scenario_files:
-        try:
-            with open(scenario_file, 'r') as f:
-                scenario_data = yaml.safe_load(f)
-            
-            name = scenario_data.get('name', scenario_file.stem)
-            description = scenario_data.get('description', 'No description available')
-            difficulty = scenario_data.get('difficulty', 'Medium')
-            
-            table.add_row(name, description, difficulty, str(scenario_file))
-            
-        except Exception as e:
-            table.add_row(scenario_file.stem, f"Error loading: {e}", "Unknown", str(scenario_file))
-    
-    console.print(table)
-
-@main.group()
-def red_team():
-    """Red Team operations"""
-    pass
-
-@red_team.command()
-@click.option('--target', '-t', required=True, help='Target IP/domain')
-@click.option('--scan-type', type=click.Choice(['basic', 'full', 'stealth']), 
-              default='basic', help='Scan type')
-@click.option('--output', '-o', type=click.Path(), help='Output file for results')
-@click.pass_context
-def recon(ctx, target: str, scan_type: str, output: Optional[str]):
-    """Perform reconnaissance on target"""
-    
-    console.print(Panel.fit(
-        f"[bold red]Red Team - Reconnaissance on {target}[/bold red]",
-        border_style="red"
-    ))
-    
-    config = ctx.obj['config']
-    red_team = RedTeamModule(config)
-    
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
-        
-        task = progress.add_task("Performing reconnaissance...", total=None)
-        
-        try:
-            results = red_team.reconnaissance.perform_reconnaissance(target, scan_type)
-            
-            progress.update(task, description="Reconnaissance completed!")
-            
-            # Display results
-            display_recon_results(results)
-            
-            # Save results
-            if output:
-                with open(output, 'w') as f:
-                    json.dump(results, f, indent=2, default=str)
-                console.print(f"[green]Results saved to: {output}[/green]")
-                
-        except Exception as e:
-            progress.update(task, description="Reconnaissance failed!")
-            console.print(f"[red]Error: {e}[/red]")
-
-@red_team.command()
-@click.option('--target', '-t', required=True, help='Target URL/IP')
-@click.option('--exploit-type', type=click.Choice(['web', 'network', 'social']), 
-              default='web', help='Exploitation type')
-@click.option('--payload', '-p', help='Custom payload')
-@click.pass_context
-def exploit(ctx, target: str, exploit_type: str, payload: Optional[str]):
-    """Execute exploitation techniques"""
-    
-    console.print(Panel.fit(
-        f"[bold red]Red Team - Exploitation on {target}[/bold red]",
-        border_style="red"
-    ))
-    
-    config = ctx.obj['config']
-    red_team = RedTeamModule(config)
-    
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
-        
-        task = progress.add_task("Executing exploitation...", total=None)
-        
-        try:
-            results = red_team.exploitation.execute_exploitation(target, exploit_type, payload)
-            
-            progress.update(task, description="Exploitation completed!")
-            display_exploit_results(results)
-                
-        except Exception as e:
-            progress.update(task, description="Exploitation failed!")
-            console.print(f"[red]Error: {e}[/red]")
-
-@main.group()
-def blue_team():
-    """Blue Team operations"""
-    pass
-
-@blue_team.command()
-@click.option('--source', '-s', multiple=True, help='Log sources to monitor')
-@click.option('--duration', '-d', type=int, default=300, help='Monitoring duration in seconds')
-@click.option('--output', '-o', type=click.Path(), help='Output file for alerts')
-@click.pass_context
-def monitor(ctx, source: List[str], duration: int, output: Optional[str]):
-    """Start security monitoring"""
-    
-    console.print(Panel.fit(
-        "[bold blue]Blue Team - Security Monitoring[/bold blue]",
-        border_style="blue"
-    ))
-    
-    config = ctx.obj['config']
-    blue_team = BlueTeamModule(config)
-    
-    sources = source if source else ['system_logs', 'network_logs', 'security_logs']
+    # Reuse cached headers for unchanged files and parse the rest concurrently
+    cache = _load_scenario_cache()
+    headers = {}
+    errors = {}
+    pending = []
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    for scenario_file in scenario_files:
+        key = str(scenario_file.resolve())
+        stat = scenario_file.stat()
+        cached = cache.get(key)
+        if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+            headers[key] = cached['header']
+        else:
+            pending.append((scenario_file, key, stat))
+    
+    if pending:
+        with ThreadPoolExecutor(max_workers=min(32, len(pending))) as executor:
+            futures = [
+                (executor.submit(_read_scenario_header, scenario_file), key, stat)
+                for scenario_file, key, stat in pending
+            ]
         
-        task = progress.add_task(f"Monitoring for {duration}s...", total=duration)
+        for future, key, stat in futures:
+            try:
+                headers[key] = future.result()
+            except Exception as e:
+                errors[key] = e
+                continue
+            cache[key] = {
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'header': headers[key]
+            }
         
-        try:
-            alerts = blue_team.log_collector.monitor_logs(sources, duration)
-            
-            progress.update(task, description="Monitoring completed!")
-            
-            # Display alerts
-            display_alerts(alerts)
-            
-            # Save alerts
-            if output:
-                with open(output, 'w') as f:
-                    json.dump(alerts, f, indent=2, default=str)
-                console.print(f"[green]Alerts saved to: {output}[/green]")
-                
-        except Exception as e:
-            progress.update(task, description="Monitoring failed!")
-            console.print(f"[red]Error: {e}[/red]")
-
-@blue_team.command()
-@click.option('--query', '-q', required=True, help='Threat hunting query')
-@click.option('--timeframe', '-t', default='24h', help='Timeframe for hunting')
-@click.pass_context
-def hunt(ctx, query: str, timeframe: str):
-    """Perform threat hunting"""
+        _save_scenario_cache(cache)
     
-    console.print(Panel.fit(
-        "[bold blue]Blue Team - Threat Hunting[/bold blue]",
-        border_style="blue"
-    ))
-    
-    config = ctx.obj['config']
-    blue_team = BlueTeamModule(config)
+    for scenario_file in scenario_files:
+        key = str(scenario_file.resolve())
+        if key in headers:
+            header = headers[key]
+            table.add_row(header['name'], header['description'], header['difficulty'], str(scenario_file))
+        else:
+            table.add_row(scenario_file.stem, f"Error loading: {errors[key]}", "Unknown", str(scenario_file))
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
-        
-        task = progress.add_task("Performing threat hunt...", total=None)
-        
-        try:
-            results = blue_team.detection_engine.threat_hunt(query, timeframe)
-            
-            progress.update(task, description="Threat hunt completed!")
-            display_hunt_results(results)
-                
-        except Exception as e:
-            progress.update(task, description="Threat hunt failed!")
-            console.print(f"[red]Error: {e}[/red]")
+    get_console().print(table)
 
 @main.command()
 @click.option('--target', '-t', required=True, help='Target to analyze')
 @click.option('--techniques', multiple=True, help='MITRE ATT&CK techniques to test')
-@click.option('--output', '-o', type=click.Path(), help='Output file for analysis')
+@click.option('--output', '-o', type=click.Path(path_type=Path), help='Output file for analysis')
+@click.option('--pretty/--compact', default=False, help='Indent JSON output for reading')
 @click.pass_context
-def analyze(ctx, target: str, techniques: List[str], output: Optional[str]):
+def analyze(ctx, target: str, techniques: List[str], output: Optional[Path], pretty: bool):
     """Analyze detection coverage for specific techniques"""
     
-    console.print(Panel.fit(
+    from ..purple_logic import PurpleTeamEngine
+    
+    get_console().print(Panel.fit(
         "[bold purple]Purple Team - Coverage Analysis[/bold purple]",
         border_style="purple"
     ))
@@ -402,11 +438,7 @@ def analyze(ctx, target: str, techniques: List[str], output: Optional[str]):
     config = ctx.obj['config']
     engine = PurpleTeamEngine(config)
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    with _progress() as progress:
         
         task = progress.add_task("Analyzing coverage...", total=None)
         
@@ -418,20 +450,23 @@ def analyze(ctx, target: str, techniques: List[str], output: Optional[str]):
             
             # Save analysis
             if output:
-                with open(output, 'w') as f:
-                    json.dump(analysis, f, indent=2, default=str)
-                console.print(f"[green]Analysis saved to: {output}[/green]")
+                _write_json(output, analysis, pretty)
+                get_console().print(f"[green]Analysis saved to: {output}[/green]")
                 
         except Exception as e:
             progress.update(task, description="Analysis failed!")
-            console.print(f"[red]Error: {e}[/red]")
+            get_console().print(f"[red]Error: {e}[/red]")
 
 @main.command()
 @click.pass_context
 def status(ctx):
     """Show toolkit status and health"""
     
-    console.print(Panel.fit(
+    from ..purple_logic import PurpleTeamEngine
+    from ..red_team import RedTeamModule
+    from ..blue_team import BlueTeamModule
+    
+    get_console().print(Panel.fit(
         "[bold cyan]Purple Team Toolkit - Status[/bold cyan]",
         border_style="cyan"
     ))
@@ -471,144 +506,49 @@ def status(ctx):
     else:
         table.add_row("Sandbox Mode", "🔴 Disabled", "Production mode")
     
-    console.print(table)
+    get_console().print(table)
 
 def display_scenario_summary(results: dict, execution_time: float):
     """Display a summary of scenario execution results"""
     
-    table = Table(title="Scenario Execution Summary")
-    table.add_column("Metric", style="cyan")
-    table.add_column("Value", style="white")
-    
-    # Attack summary
-    attacks = results.get('red_team', {}).get('attacks', [])
-    table.add_row("Attacks Executed", str(len(attacks)))
-    
-    # Detection summary
-    detections = results.get('blue_team', {}).get('detections', [])
-    table.add_row("Detections Triggered", str(len(detections)))
+    attacks = (results.get('red_team') or {}).get('attacks') or []
+    detections = (results.get('blue_team') or {}).get('detections') or []
+    purple_logic = results.get('purple_logic') or {}
     
     # Coverage analysis
-    coverage = results.get('purple_logic', {}).get('coverage', {})
+    coverage = purple_logic.get('coverage') or {}
+    if is_dataclass(coverage):
+        coverage = asdict(coverage)
     detected = coverage.get('detected', 0)
     total = coverage.get('total', 0)
-    coverage_percent = (detected / total * 100) if total > 0 else 0
-    
-    table.add_row("Detection Coverage", f"{detected}/{total} ({coverage_percent:.1f}%)")
-    
-    # Score
-    score = results.get('purple_logic', {}).get('score', 0)
-    table.add_row("Overall Score", f"{score:.1f}/100")
-    
-    # Execution time
-    table.add_row("Execution Time", f"{execution_time:.2f} seconds")
-    
-    console.print(table)
-
-def display_recon_results(results: dict):
-    """Display reconnaissance results"""
-    
-    table = Table(title="Reconnaissance Results")
-    table.add_column("Technique", style="cyan")
-    table.add_column("Status", style="white")
-    table.add_column("Details", style="dim")
-    
-    for result in results.get('results', []):
-        status = "✅ Success" if result.get('success') else "❌ Failed"
-        details = result.get('description', 'No details')
-        table.add_row(result.get('technique', 'Unknown'), status, details)
-    
-    console.print(table)
-
-def display_exploit_results(results: dict):
-    """Display exploitation results"""
-    
-    table = Table(title="Exploitation Results")
-    table.add_column("Technique", style="cyan")
-    table.add_column("Status", style="white")
-    table.add_column("Details", style="dim")
-    
-    for result in results.get('results', []):
-        status = "✅ Success" if result.get('success') else "❌ Failed"
-        details = result.get('description', 'No details')
-        table.add_row(result.get('technique', 'Unknown'), status, details)
+    coverage_percent = detected * 100.0 / total if total else 0.0
     
-    console.print(table)
-
-def display_alerts(alerts: List[dict]):
-    """Display security alerts"""
+    score = purple_logic.get('score', 0)
     
-    if not alerts:
-        console.print("[yellow]No alerts detected during monitoring period.[/yellow]")
-        return
+    rows = [
+        ("Attacks Executed", str(len(attacks))),
+        ("Detections Triggered", str(len(detections))),
+        ("Detection Coverage", f"{detected}/{total} ({coverage_percent:.1f}%)"),
+        ("Overall Score", f"{score:.1f}/100"),
+        ("Execution Time", f"{execution_time:.2f} seconds")
+    ]
     
-    table = Table(title="Security Alerts")
-    table.add_column("Time", style="cyan")
-    table.add_column("Severity", style="white")
-    table.add_column("Source", style="dim")
-    table.add_column("Description", style="white")
-    
-    for alert in alerts:
-        severity_color = {
-            'critical': 'red',
-            'high': 'yellow',
-            'medium': 'blue',
-            'low': 'green'
-        }.get(alert.get('severity', 'medium'), 'white')
-        
-        table.add_row(
-            alert.get('timestamp', 'Unknown'),
-            f"[{severity_color}]{alert.get('severity', 'Unknown')}[/{severity_color}]",
-            alert.get('source', 'Unknown'),
-            alert.get('description', 'No description')
-        )
-    
-    console.print(table)
-
-def display_hunt_results(results: List[dict]):
-    """Display threat hunting results"""
-    
-    if not results:
-        console.print("[yellow]No threats found during hunt.[/yellow]")
-        return
-    
-    table = Table(title="Threat Hunting Results")
-    table.add_column("Indicator", style="cyan")
-    table.add_column("Type", style="white")
-    table.add_column("Confidence", style="dim")
-    table.add_column("Description", style="white")
-    
-    for result in results:
-        table.add_row(
-            result.get('indicator', 'Unknown'),
-            result.get('type', 'Unknown'),
-            f"{result.get('confidence', 0)}%",
-            result.get('description', 'No description')
-        )
-    
-    console.print(table)
+    columns = (("Metric", "cyan"), ("Value", "white"))
+    get_console().print(build_table("Scenario Execution Summary", columns, rows))
 
 def display_coverage_analysis(analysis: dict):
     """Display coverage analysis results"""
     
-    table = Table(title="Detection Coverage Analysis")
-    table.add_column("Technique", style="cyan")
-    table.add_column("Coverage", style="white")
-    table.add_column("Status", style="dim")
-    
-    for technique, coverage in analysis.get('techniques', {}).items():
+    columns = (("Technique", "cyan"), ("Coverage", "white"), ("Status", "dim"))
+    rows = []
+    for technique, coverage in (analysis.get('techniques') or {}).items():
         coverage_percent = coverage.get('coverage', 0)
         status = "✅ Detected" if coverage_percent > 0 else "❌ Not Detected"
-        
-        table.add_row(
-            technique,
-            f"{coverage_percent:.1f}%",
-            status
-        )
+        rows.append((technique, f"{coverage_percent:.1f}%", status))
     
     overall_coverage = analysis.get('overall_coverage', 0)
-    console.print(table)
-    console.print(f"[bold]Overall Coverage: {overall_coverage:.1f}%[/bold]")
+    get_console().print(build_table("Detection Coverage Analysis", columns, rows))
+    get_console().print(f"[bold]Overall Coverage: {overall_coverage:.1f}%[/bold]")
 
 if __name__ == '__main__':
     main()
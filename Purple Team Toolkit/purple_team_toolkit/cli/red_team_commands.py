@@ -0,0 +1,112 @@
+"""
+Red Team CLI Commands for Purple Team Toolkit
+"""
+
+import click
+from pathlib import Path
+from rich.panel import Panel
+from typing import Optional, List
+
+from .commands import get_console, _progress, _write_json, build_table
+
+RESULT_COLUMNS = (("Technique", "cyan"), ("Status", "white"), ("Details", "dim"))
+
+@click.group()
+def red_team():
+    """Red Team operations"""
+    pass
+
+@red_team.command()
+@click.option('--target', '-t', required=True, help='Target IP/domain')
+@click.option('--scan-type', type=click.Choice(['basic', 'full', 'stealth']), 
+              default='basic', help='Scan type')
+@click.option('--output', '-o', type=click.Path(path_type=Path), help='Output file for results')
+@click.option('--pretty/--compact', default=False, help='Indent JSON output for reading')
+@click.pass_context
+def recon(ctx, target: str, scan_type: str, output: Optional[Path], pretty: bool):
+    """Perform reconnaissance on target"""
+    
+    from ..red_team import RedTeamModule
+    
+    get_console().print(Panel.fit(
+        f"[bold red]Red Team - Reconnaissance on {target}[/bold red]",
+        border_style="red"
+    ))
+    
+    config = ctx.obj['config']
+    red_team = RedTeamModule(config)
+    
+    with _progress() as progress:
+        
+        task = progress.add_task("Performing reconnaissance...", total=None)
+        
+        try:
+            results = red_team.reconnaissance.perform_reconnaissance(target, scan_type)
+            
+            progress.update(task, description="Reconnaissance completed!")
+            
+            # Display results
+            display_recon_results(results)
+            
+            # Save results
+            if output:
+                _write_json(output, results, pretty)
+                get_console().print(f"[green]Results saved to: {output}[/green]")
+                
+        except Exception as e:
+            progress.update(task, description="Reconnaissance failed!")
+            get_console().print(f"[red]Error: {e}[/red]")
+
+@red_team.command()
+@click.option('--target', '-t', required=True, help='Target URL/IP')
+@click.option('--exploit-type', type=click.Choice(['web', 'network', 'social']), 
+              default='web', help='Exploitation type')
+@click.option('--payload', '-p', help='Custom payload')
+@click.pass_context
+def exploit(ctx, target: str, exploit_type: str, payload: Optional[str]):
+    """Execute exploitation techniques"""
+    
+    from ..red_team import RedTeamModule
+    
+    get_console().print(Panel.fit(
+        f"[bold red]Red Team - Exploitation on {target}[/bold red]",
+        border_style="red"
+    ))
+    
+    config = ctx.obj['config']
+    red_team = RedTeamModule(config)
+    
+    with _progress() as progress:
+        
+        task = progress.add_task("Executing exploitation...", total=None)
+        
+        try:
+            results = red_team.exploitation.execute_exploitation(target, exploit_type, payload)
+            
+            progress.update(task, description="Exploitation completed!")
+            display_exploit_results(results)
+                
+        except Exception as e:
+            progress.update(task, description="Exploitation failed!")
+            get_console().print(f"[red]Error: {e}[/red]")
+
+def display_recon_results(results: dict):
+    """Display reconnaissance results"""
+    
+    get_console().print(build_table("Reconnaissance Results", RESULT_COLUMNS, _result_rows(results)))
+
+def display_exploit_results(results: dict):
+    """Display exploitation results"""
+    
+    get_console().print(build_table("Exploitation Results", RESULT_COLUMNS, _result_rows(results)))
+
+def _result_rows(results: dict) -> List[tuple]:
+    """Build technique/status/details rows for attack results"""
+    return [
+        (
+            result.get('technique', 'Unknown'),
+            "✅ Success" if result.get('success') else "❌ Failed",
+            result.get('description', 'No details')
+        )
+        for result in results.get('results', [])
+    ]
@@ -2,14 +2,78 @@
 Configuration management for Purple Team Toolkit
 """
 
+import copy
 import json
 import yaml
 from pathlib import Path
 from typing import Dict, Any, Optional
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
+import functools
 import logging
 
-@dataclass
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+# Set once setup_logging has configured the root logger for this process
+_LOGGING_CONFIGURED = False
+
+_CONFIG_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "sandbox_mode": {"type": "boolean"},
+        "rate_limiting": {"type": "boolean"},
+        "confirmation_required": {"type": "boolean"},
+        "full_audit_logging": {"type": "boolean"},
+        "log_level": {"type": "string"},
+        "log_file": {"type": ["string", "null"]},
+        "output_directory": {"type": "string"},
+        "plugins_directory": {"type": "string"},
+        "default_timeout": {"type": "integer", "exclusiveMinimum": 0},
+        "max_retries": {"type": "integer", "minimum": 0},
+        "red_team_modules": {"type": "object"},
+        "blue_team_modules": {"type": "object"},
+        "correlation_rules": {"type": "object"},
+        "mitre_attack_mapping": {"type": "boolean"},
+        "attack_framework_version": {"type": "string"}
+    },
+    "additionalProperties": False
+}
+
+@functools.lru_cache(maxsize=None)
+def _config_validator():
+    """Build the JSON-Schema validator for configuration data once per process"""
+    import jsonschema
+    
+    return jsonschema.Draft202012Validator(_CONFIG_SCHEMA)
+
+def _schema_errors(data: Any) -> list:
+    """Describe every schema violation in configuration data"""
+    errors = []
+    for error in _config_validator().iter_errors(data):
+        location = '.'.join(str(part) for part in error.absolute_path)
+        errors.append(f"{location}: {error.message}" if location else error.message)
+    return errors
+
+@functools.lru_cache(maxsize=32)
+def _load_config_data(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse and validate a configuration file once per (path, modification time, size)"""
+    config_path = Path(path)
+    
+    with open(config_path, 'r') as f:
+        if config_path.suffix.lower() in ['.yaml', '.yml']:
+            data = yaml.load(f, Loader=SafeLoader)
+        else:
+            data = json.load(f)
+    
+    errors = _schema_errors(data)
+    if errors:
+        raise ValueError(f"Invalid configuration file {config_path}: {'; '.join(errors)}")
+    
+    return data
+
+@dataclass(slots=True)
 class Config:
     """Configuration class for Purple Team Toolkit"""
     
@@ -52,13 +116,12 @@ class Config:
         if not config_path.exists():
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
         
-        with open(config_path, 'r') as f:
-            if config_path.suffix.lower() in ['.yaml', '.yml']:
-                data = yaml.safe_load(f)
-            else:
-                data = json.load(f)
+        stat = config_path.stat()
+        data = _load_config_data(str(config_path.resolve()), stat.st_mtime_ns, stat.st_size)
         
-        return cls(**data)
+        # Copy the module sections so instances never mutate the cached data
+        return cls(**{key: copy.deepcopy(value) if isinstance(value, dict) else value
+                      for key, value in data.items()})
     
     @classmethod
     def default(cls) -> 'Config':
@@ -90,24 +153,30 @@ class Config:
         
         with open(config_path, 'w') as f:
             if config_path.suffix.lower() in ['.yaml', '.yml']:
-                yaml.dump(data, f, default_flow_style=False, indent=2)
+                yaml.dump(data, f, Dumper=SafeDumper, default_flow_style=False, indent=2)
             else:
                 json.dump(data, f, indent=2)
     
     def setup_logging(self):
-        """Setup logging configuration"""
+        """Setup logging configuration (only the first call in a process has any effect)"""
+        global _LOGGING_CONFIGURED
+        if _LOGGING_CONFIGURED:
+            return
+        
+        handlers = [logging.StreamHandler()]
+        if self.log_file:
+            handlers.append(logging.FileHandler(self.log_file))
+        
         logging.basicConfig(
             level=getattr(logging, self.log_level.upper()),
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.StreamHandler(),
-                logging.FileHandler(self.log_file) if self.log_file else logging.NullHandler()
-            ]
+            handlers=handlers
         )
+        _LOGGING_CONFIGURED = True
     
     def validate(self) -> bool:
         """Validate configuration settings"""
-        errors = []
+        errors = _schema_errors(asdict(self))
         
         # Check required directories
         if not Path(self.output_directory).exists():
@@ -127,13 +196,6 @@ class Config:
         if self.log_level.upper() not in valid_log_levels:
             errors.append(f"Invalid log level: {self.log_level}")
         
-        # Validate timeouts
-        if self.default_timeout <= 0:
-            errors.append("Default timeout must be positive")
-        
-        if self.max_retries < 0:
-            errors.append("Max retries cannot be negative")
-        
         if errors:
             raise ValueError(f"Configuration validation failed: {'; '.join(errors)}")
         
@@ -5,10 +5,11 @@ Provides correlation between Red Team attacks and Blue Team detections,
 coverage analysis, and reporting capabilities.
 """
 
-from .correlation import PurpleTeamEngine, CorrelationResult, CoverageAnalysis
+from .correlation import PurpleTeamEngine, CorrelationResult, CoverageAnalysis, save_results
 
 __all__ = [
     "PurpleTeamEngine",
     "CorrelationResult", 
-    "CoverageAnalysis"
+    "CoverageAnalysis",
+    "save_results"
 ]
@@ -5,22 +5,155 @@ Correlates Red Team attack activities with Blue Team detections
 and provides coverage analysis and reporting.
 """
 
+import bisect
+import csv
+import functools
+import html
+import io
+import itertools
 import json
 import time
 import logging
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, field
+import operator
+import re
+import sys
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Any, Optional
+from dataclasses import dataclass, field, fields, asdict, is_dataclass
 from pathlib import Path
 from datetime import datetime
-import pandas as pd
-from jinja2 import Template
 
-from ..red_team import ReconnaissanceModule, ExploitationModule, PostExploitationModule, PayloadManager
-from ..blue_team import LogCollector, DetectionEngine, AlertManager
-from ..blue_team.normalization import EventNormalizer, NormalizedEvent
 from ..config import Config
 
-@dataclass
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Upper bound on Red Team activities and Blue Team log sources run at once
+MAX_PARALLEL_ACTIVITIES = 8
+# Concurrent Red Team activities allowed against targets when rate limiting is enabled
+RATE_LIMITED_ACTIVITIES = 2
+
+DEFAULT_LOG_SOURCES = ('system_logs', 'network_logs', 'application_logs', 'security_logs')
+
+def _json_default(obj: Any) -> Any:
+    """Serialize dataclasses (attack results, events) as objects and anything else as text"""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    return str(obj)
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern a string value, leaving None and non-string values untouched"""
+    return sys.intern(value) if type(value) is str else value
+
+@functools.lru_cache(maxsize=None)
+def _field_getter(cls: type) -> tuple:
+    """Field names of a result dataclass and a C-level getter returning their values as a tuple"""
+    names = tuple(f.name for f in fields(cls))
+    getter = operator.attrgetter(*names)
+    if len(names) == 1:
+        # attrgetter returns a bare value rather than a tuple for a single name
+        return names, lambda obj: (getter(obj),)
+    return names, getter
+
+def _as_record(obj: Any) -> Dict[str, Any]:
+    """Return a field mapping for a result dataclass; results loaded from JSON are already dicts"""
+    if is_dataclass(obj):
+        names, getter = _field_getter(type(obj))
+        return dict(zip(names, getter(obj)))
+    return obj
+
+def _attack_keywords(technique: str) -> str:
+    """Text to look for in detection descriptions for an attack technique"""
+    return technique.lower().replace('_', ' ')
+
+def _event_field(event: Any, name: str, default: Any = None) -> Any:
+    """Read a field from a collected SecurityEvent or an event dict loaded from JSON"""
+    if isinstance(event, dict):
+        return event.get(name, default)
+    return getattr(event, name, default)
+
+def _dump_json_bytes(data: Any, pretty: bool = True) -> bytes:
+    """Serialize results as UTF-8 JSON, indented unless compact output is asked for"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option, default=_json_default)
+    if pretty:
+        return json.dumps(data, indent=2, default=_json_default).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), default=_json_default).encode('utf-8')
+
+def _dumps_json(data: Any) -> str:
+    """Serialize results as an indented JSON string"""
+    return _dump_json_bytes(data).decode('utf-8')
+
+def save_results(results: Dict[str, Any], path, pretty: bool = True) -> Path:
+    """Write scenario results to a JSON file in a single write"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(_dump_json_bytes(results, pretty))
+    return path
+
+# Report templates ship with the package; compiled bytecode is cached on disk between runs
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+HTML_REPORT_TEMPLATE = "report.html"
+# Written at build time by setup.py; absent in a source checkout
+COMPILED_TEMPLATES_DIR = Path(__file__).parent / "templates_compiled"
+
+# One correlation table row; laid out to match the indentation of report.html
+CORRELATION_ROW_HTML = """
+            <tr class="{row_class}">
+                <td>{attack_technique}</td>
+                <td>{expected_detection}</td>
+                <td>{actual_detection}</td>
+                <td>{detected}</td>
+                <td>{mitre_technique}</td>
+                <td>{confidence:.1f}%</td>
+            </tr>
+            """
+
+def _correlation_rows_html(correlations: List[Any]) -> Iterator[str]:
+    """Render correlation table rows lazily; the template inserts each one as-is"""
+    for corr in correlations:
+        corr = _as_record(corr)
+        detected = corr['detected']
+        yield CORRELATION_ROW_HTML.format(
+            row_class='detected' if detected else 'not-detected',
+            attack_technique=html.escape(str(corr['attack_technique'])),
+            expected_detection=html.escape(str(corr['expected_detection'])),
+            actual_detection=html.escape(str(corr['actual_detection'] or 'None')),
+            detected='Yes' if detected else 'No',
+            mitre_technique=html.escape(str(corr['mitre_technique'] or 'N/A')),
+            confidence=corr['confidence'] * 100
+        )
+
+@functools.lru_cache(maxsize=None)
+def _report_environment():
+    """Build the Jinja2 environment shared by all report templates"""
+    from jinja2 import ChoiceLoader, Environment, FileSystemBytecodeCache, FileSystemLoader, ModuleLoader
+    
+    loader = FileSystemLoader(str(TEMPLATES_DIR))
+    if COMPILED_TEMPLATES_DIR.is_dir():
+        # Installed builds ship templates compiled to Python modules by setup.py
+        loader = ChoiceLoader([ModuleLoader(str(COMPILED_TEMPLATES_DIR)), loader])
+    
+    return Environment(
+        loader=loader,
+        bytecode_cache=FileSystemBytecodeCache(),
+        auto_reload=False,
+        autoescape=True
+    )
+
+@functools.lru_cache(maxsize=None)
+def _html_report_template():
+    """Compile the HTML report template once per process"""
+    return _report_environment().get_template(HTML_REPORT_TEMPLATE)
+
+@dataclass(slots=True)
 class CorrelationResult:
     """Result of attack-detection correlation"""
     attack_technique: str
@@ -33,8 +166,15 @@ class CorrelationResult:
     mitre_technique: Optional[str] = None
     confidence: float = 0.0
     details: Dict[str, Any] = field(default_factory=dict)
+    
+    def __post_init__(self):
+        # Technique names repeat across results; share one string object per name
+        self.attack_technique = _intern(self.attack_technique)
+        self.expected_detection = _intern(self.expected_detection)
+        self.actual_detection = _intern(self.actual_detection)
+        self.mitre_technique = _intern(self.mitre_technique)
 
-@dataclass
+@dataclass(slots=True)
 class CoverageAnalysis:
     """Analysis of detection coverage"""
     total_attacks: int
@@ -54,17 +194,6 @@ class PurpleTeamEngine:
         self.config = config
         self.logger = logging.getLogger(__name__)
         
-        # Initialize Red Team modules
-        self.recon_module = ReconnaissanceModule(config.red_team_modules)
-        self.exploitation_module = ExploitationModule(config.red_team_modules)
-        self.post_exploitation_module = PostExploitationModule(config.red_team_modules)
-        self.payload_manager = PayloadManager(config.red_team_modules)
-        
-        # Initialize Blue Team modules
-        self.log_collector = LogCollector(config.blue_team_modules)
-        self.detection_engine = DetectionEngine(config.blue_team_modules)
-        self.alert_manager = AlertManager(config.blue_team_modules)
-        self.event_normalizer = EventNormalizer(config.blue_team_modules)
         
         # Correlation state
         self.attack_results: List[Dict[str, Any]] = []
@@ -74,6 +203,49 @@ class PurpleTeamEngine:
         # Setup logging
         config.setup_logging()
     
+    # Red and Blue Team modules are built on first use so that engines used
+    # only for reporting or analysis do not import the attack/monitoring stack
+    
+    @functools.cached_property
+    def recon_module(self):
+        from ..red_team import ReconnaissanceModule
+        return ReconnaissanceModule(self.config.red_team_modules)
+    
+    @functools.cached_property
+    def exploitation_module(self):
+        from ..red_team import ExploitationModule
+        return ExploitationModule(self.config.red_team_modules)
+    
+    @functools.cached_property
+    def post_exploitation_module(self):
+        from ..red_team import PostExploitationModule
+        return PostExploitationModule(self.config.red_team_modules)
+    
+    @functools.cached_property
+    def payload_manager(self):
+        from ..red_team import PayloadManager
+        return PayloadManager(self.config.red_team_modules)
+    
+    @functools.cached_property
+    def log_collector(self):
+        from ..blue_team import LogCollector
+        return LogCollector(self.config.blue_team_modules)
+    
+    @functools.cached_property
+    def detection_engine(self):
+        from ..blue_team import DetectionEngine
+        return DetectionEngine(self.config.blue_team_modules)
+    
+    @functools.cached_property
+    def alert_manager(self):
+        from ..blue_team import AlertManager
+        return AlertManager(self.config.blue_team_modules)
+    
+    @functools.cached_property
+    def event_normalizer(self):
+        from ..blue_team.normalization import EventNormalizer
+        return EventNormalizer(self.config.blue_team_modules)
+    
     def execute_scenario(self, scenario_config: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a complete Purple Team scenario"""
         self.logger.info("Starting Purple Team scenario execution")
@@ -115,8 +287,8 @@ class PurpleTeamEngine:
                 'total_detections': len(blue_team_results)
             },
             'purple_logic': {
-                'correlations': [self._correlation_to_dict(corr) for corr in correlation_results],
-                'coverage': self._coverage_to_dict(coverage_analysis),
+                'correlations': correlation_results,
+                'coverage': coverage_analysis,
                 'score': coverage_analysis.score
             }
         }
@@ -126,36 +298,74 @@ class PurpleTeamEngine:
         return results
     
     def _execute_red_team_activities(self, activities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Execute Red Team attack activities"""
-        results = []
+        """Execute Red Team attack activities concurrently, keeping scenario order"""
+        if not activities:
+            return []
         
-        for activity in activities:
-            try:
-                module = activity.get('module')
-                technique = activity.get('technique')
-                target = activity.get('target')
-                parameters = activity.get('parameters', {})
-                
+        # Throttle traffic towards targets when rate limiting is enabled
+        slots = threading.BoundedSemaphore(RATE_LIMITED_ACTIVITIES) if self.config.rate_limiting else None
+        
+        self._build_red_team_modules(activities)
+        
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_ACTIVITIES, len(activities))) as executor:
+            results = list(executor.map(
+                lambda activity: self._execute_red_team_activity(activity, slots), activities
+            ))
+        
+        return [result for result in results if result]
+    
+    def _build_red_team_modules(self, activities: List[Dict[str, Any]]):
+        """Create the Red Team modules the activities use so workers never race to create them"""
+        modules = {activity.get('module') for activity in activities}
+        
+        if 'recon' in modules:
+            recon_module = self.recon_module
+            if any(activity.get('technique') == 'nmap_scan' for activity in activities):
+                # Locating nmap is itself lazy; resolve it once here rather than in every worker
+                _ = recon_module.nmap_available
+        if 'exploitation' in modules:
+            _ = self.exploitation_module
+        if 'post_exploitation' in modules:
+            _ = self.post_exploitation_module
+    
+    def _build_blue_team_modules(self, normalize: bool):
+        """Create the Blue Team modules monitoring uses so workers never race to create them"""
+        _ = self.log_collector
+        _ = self.detection_engine
+        _ = self.alert_manager
+        if normalize:
+            _ = self.event_normalizer
+    
+    def _execute_red_team_activity(self, activity: Dict[str, Any],
+                                   slots: Optional[threading.BoundedSemaphore] = None) -> Optional[Dict[str, Any]]:
+        """Execute a single Red Team attack activity"""
+        try:
+            module = activity.get('module')
+            technique = activity.get('technique')
+            target = activity.get('target')
+            parameters = activity.get('parameters', {})
+            
+            if module == 'recon':
+                execute = self._execute_recon_activity
+            elif module == 'exploitation':
+                execute = self._execute_exploitation_activity
+            elif module == 'post_exploitation':
+                execute = self._execute_post_exploitation_activity
+            else:
+                self.logger.warning(f"Unknown Red Team module: {module}")
+                return None
+            
+            if slots is None:
                 self.logger.info(f"Executing Red Team activity: {module}.{technique} on {target}")
+                return execute(technique, target, parameters)
+            
+            with slots:
+                self.logger.info(f"Executing Red Team activity: {module}.{technique} on {target}")
+                return execute(technique, target, parameters)
                 
-                if module == 'recon':
-                    result = self._execute_recon_activity(technique, target, parameters)
-                elif module == 'exploitation':
-                    result = self._execute_exploitation_activity(technique, target, parameters)
-                elif module == 'post_exploitation':
-                    result = self._execute_post_exploitation_activity(technique, target, parameters)
-                else:
-                    self.logger.warning(f"Unknown Red Team module: {module}")
-                    continue
-                
-                if result:
-                    results.append(result)
-                    
-            except Exception as e:
-                self.logger.error(f"Error executing Red Team activity: {e}")
-                continue
-        
-        return results
+        except Exception as e:
+            self.logger.error(f"Error executing Red Team activity: {e}")
+            return None
     
     def _execute_recon_activity(self, technique: str, target: str, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Execute reconnaissance activity"""
@@ -217,104 +427,96 @@ class PurpleTeamEngine:
         }
     
     def _execute_blue_team_monitoring(self, monitoring_config: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Execute Blue Team monitoring activities"""
-        results = []
-        
+        """Execute Blue Team monitoring activities, collecting from each log source concurrently"""
         # Handle different monitoring config formats
         if not monitoring_config:
             # Default sources if no config provided
-            log_sources = ['system_logs', 'network_logs', 'application_logs', 'security_logs']
-            for source in log_sources:
-                try:
-                    self.logger.info(f"Collecting logs from: {source}")
-                    events = self.log_collector.collect_logs(source)
-                    
-                    # Normalize events
-                    normalized_events = self.event_normalizer.normalize_events(events)
-                    
-                    # Apply detection rules
-                    detected_events = self.detection_engine.detect_events(events)
-                    
-                    # Process alerts
-                    alerts = self.alert_manager.process_alerts(detected_events)
-                    
-                    results.extend([
-                        {
-                            'source': source,
-                            'event': event,
-                            'normalized': normalized_event,
-                            'detected': detected_event,
-                            'alert': alert,
-                            'timestamp': time.time()
-                        }
-                        for event, normalized_event, detected_event, alert in zip(
-                            events, normalized_events, detected_events, alerts
-                        )
-                    ])
-                except Exception as e:
-                    self.logger.error(f"Error in Blue Team monitoring for {source}: {e}")
-                    continue
+            tasks = [(source, {}) for source in DEFAULT_LOG_SOURCES]
         else:
             # Process structured monitoring config
+            tasks = []
             for monitoring_item in monitoring_config:
-                try:
-                    module = monitoring_item.get('module', 'unknown')
-                    detection = monitoring_item.get('detection', 'unknown')
-                    sources = monitoring_item.get('sources', [])
-                    
-                    self.logger.info(f"Collecting logs from: {monitoring_item}")
-                    
-                    # Collect from all sources for this monitoring item
-                    for source in sources:
-                        events = self.log_collector.collect_logs(source)
-                        
-                        # Normalize events
-                        normalized_events = self.event_normalizer.normalize_events(events)
-                        
-                        # Apply detection rules
-                        detected_events = self.detection_engine.detect_events(events)
-                        
-                        # Process alerts
-                        alerts = self.alert_manager.process_alerts(detected_events)
-                        
-                        results.extend([
-                            {
-                                'source': source,
-                                'module': module,
-                                'detection': detection,
-                                'event': event,
-                                'normalized': normalized_event,
-                                'detected': detected_event,
-                                'alert': alert,
-                                'timestamp': time.time()
-                            }
-                            for event, normalized_event, detected_event, alert in zip(
-                                events, normalized_events, detected_events, alerts
-                            )
-                        ])
-                
-                except Exception as e:
-                    self.logger.error(f"Error in Blue Team monitoring for {monitoring_item}: {e}")
-                    continue
+                self.logger.info(f"Collecting logs from: {monitoring_item}")
+                context = {
+                    'module': monitoring_item.get('module', 'unknown'),
+                    'detection': monitoring_item.get('detection', 'unknown')
+                }
+                tasks.extend((source, context) for source in monitoring_item.get('sources', []))
+        
+        if not tasks:
+            return []
+        
+        # Correlation only reads raw events; normalize them only when configured to
+        normalize = self.config.correlation_rules.get('require_normalized', False)
+        
+        self._build_blue_team_modules(normalize)
+        
+        results = []
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_ACTIVITIES, len(tasks))) as executor:
+            for source_results in executor.map(lambda task: self._monitor_source(*task, normalize), tasks):
+                results.extend(source_results)
         
         return results
     
+    def _monitor_source(self, source: str, context: Dict[str, Any],
+                        normalize: bool = False) -> List[Dict[str, Any]]:
+        """Collect, normalize, detect and alert on the events of one log source"""
+        try:
+            if not context:
+                self.logger.info(f"Collecting logs from: {source}")
+            events = self.log_collector.collect_logs(source)
+            
+            # Normalize events
+            if normalize:
+                normalized_events = self.event_normalizer.normalize_events(events)
+            else:
+                normalized_events = itertools.repeat(None)
+            
+            # Apply detection rules
+            detected_events = self.detection_engine.detect_events(events)
+            
+            # Process alerts
+            alerts = self.alert_manager.process_alerts(detected_events)
+            
+            return [
+                {
+                    'source': source,
+                    **context,
+                    'event': event,
+                    'normalized': normalized_event,
+                    'detected': detected_event,
+                    'alert': alert,
+                    'timestamp': time.time()
+                }
+                for event, normalized_event, detected_event, alert in zip(
+                    events, normalized_events, detected_events, alerts
+                )
+            ]
+        except Exception as e:
+            self.logger.error(f"Error in Blue Team monitoring for {source}: {e}")
+            return []
+    
     def _correlate_attacks_and_detections(self, attacks: List[Dict[str, Any]], 
                                         detections: List[Dict[str, Any]], 
                                         correlation_rules: List[Dict[str, Any]]) -> List[CorrelationResult]:
         """Correlate Red Team attacks with Blue Team detections"""
         correlations = []
+        detection_index = self._index_detections(
+            detections, {_attack_keywords(attack['technique']) for attack in attacks}
+        )
+        
+        # Index rules by attack technique; reversed so the first matching rule wins
+        rules_by_attack = {rule.get('attack'): rule for rule in reversed(correlation_rules)}
+        
+        # Detected events are the same for every attack; share one list across all correlations
+        detection_data = [d['event'] for d in detections if d['detected']]
         
         for attack in attacks:
             attack_technique = attack['technique']
             attack_result = attack['result']
             
             # Find matching correlation rule
-            matching_rule = None
-            for rule in correlation_rules:
-                if rule.get('attack') == attack_technique:
-                    matching_rule = rule
-                    break
+            matching_rule = rules_by_attack.get(attack_technique)
             
             if not matching_rule:
                 # Create default correlation
@@ -336,15 +538,15 @@ class PurpleTeamEngine:
             detection_time = None
             detected = False
             
-            for detection in detections:
-                if self._matches_detection(attack_technique, detection, expected_detection):
-                    actual_detection = detection['event']['event_type']
-                    detection_time = detection['timestamp']
-                    detected = True
-                    break
+            match = self._find_matching_detection(detection_index, attack_technique, expected_detection)
+            if match is not None:
+                detection = detections[match]
+                actual_detection = _event_field(detection['event'], 'event_type')
+                detection_time = detection['timestamp']
+                detected = True
             
             # Calculate confidence
-            confidence = self._calculate_correlation_confidence(attack, detections, expected_detection)
+            confidence = self._calculate_correlation_confidence(attack, detection_index, expected_detection)
             
             correlation = CorrelationResult(
                 attack_technique=attack_technique,
@@ -356,7 +558,7 @@ class PurpleTeamEngine:
                 confidence=confidence,
                 details={
                     'attack_data': attack_result.data,
-                    'detection_data': [d['event'] for d in detections if d['detected']]
+                    'detection_data': detection_data
                 }
             )
             
@@ -364,29 +566,87 @@ class PurpleTeamEngine:
         
         return correlations
     
-    def _matches_detection(self, attack_technique: str, detection: Dict[str, Any], expected_detection: str) -> bool:
-        """Check if a detection matches an attack"""
-        detection_event = detection['event']
+    def _index_detections(self, detections: List[Dict[str, Any]], attack_keywords: set = frozenset()) -> Dict[str, Any]:
+        """Extract the detection fields used for matching once per scenario"""
+        event_types = []
+        descriptions = []
+        first_by_mitre = {}
+        
+        for position, detection in enumerate(detections):
+            detection_event = detection['event']
+            event_types.append(_intern(_event_field(detection_event, 'event_type', '')))
+            descriptions.append(_event_field(detection_event, 'description', '').lower())
+            
+            mitre_technique = _event_field(detection_event, 'mitre_technique')
+            if mitre_technique:
+                first_by_mitre.setdefault(mitre_technique, position)
         
-        # Check if detection type matches expected
-        if expected_detection in detection_event.get('event_type', ''):
-            return True
+        return {
+            'sorted_times': sorted(detection['timestamp'] for detection in detections),
+            'event_types': event_types,
+            'descriptions': descriptions,
+            'first_by_mitre': first_by_mitre,
+            'first_by_keywords': self._index_keywords(descriptions, attack_keywords),
+            # Memoized first matches, filled in as attacks are correlated
+            'first_by_expected': {}
+        }
+    
+    def _index_keywords(self, descriptions: List[str], keywords: set) -> Dict[str, Optional[int]]:
+        """Find the first description containing each keyword with a single regex pass per description"""
+        first_by_keywords = dict.fromkeys(keywords)
+        if not keywords or not descriptions:
+            return first_by_keywords
+        
+        # The lookahead reports the longest keyword starting at each offset; any
+        # shorter keyword that is a prefix of it matches at that offset too
+        ordered = sorted(keywords, key=len, reverse=True)
+        pattern = re.compile('(?=(' + '|'.join(map(re.escape, ordered)) + '))')
+        prefixes = {keyword: [other for other in ordered if keyword.startswith(other)] for keyword in ordered}
+        
+        remaining = set(keywords)
+        for position, description in enumerate(descriptions):
+            for match in pattern.finditer(description):
+                for keyword in prefixes[match.group(1)]:
+                    if keyword in remaining:
+                        first_by_keywords[keyword] = position
+                        remaining.discard(keyword)
+            if not remaining:
+                break
         
-        # Check MITRE technique match
-        if detection_event.get('mitre_technique') and detection_event['mitre_technique'] == expected_detection:
-            return True
+        return first_by_keywords
+    
+    def _find_matching_detection(self, index: Dict[str, Any], attack_technique: str,
+                                 expected_detection: str) -> Optional[int]:
+        """Return the position of the first detection matching an attack
         
-        # Check description keywords
-        description = detection_event.get('description', '').lower()
-        attack_keywords = attack_technique.lower().replace('_', ' ')
+        A detection matches when its event type contains the expected
+        detection, its MITRE technique equals it, or its description
+        contains the attack technique's keywords.
+        """
+        first_by_expected = index['first_by_expected']
+        if expected_detection not in first_by_expected:
+            first_by_expected[expected_detection] = next(
+                (i for i, event_type in enumerate(index['event_types']) if expected_detection in event_type),
+                None
+            )
         
-        if attack_keywords in description:
-            return True
+        attack_keywords = _attack_keywords(attack_technique)
+        first_by_keywords = index['first_by_keywords']
+        if attack_keywords not in first_by_keywords:
+            first_by_keywords.update(self._index_keywords(index['descriptions'], {attack_keywords}))
         
-        return False
+        candidates = [
+            position for position in (
+                first_by_expected[expected_detection],
+                index['first_by_mitre'].get(expected_detection),
+                first_by_keywords[attack_keywords]
+            )
+            if position is not None
+        ]
+        return min(candidates) if candidates else None
     
     def _calculate_correlation_confidence(self, attack: Dict[str, Any], 
-                                        detections: List[Dict[str, Any]], 
+                                        detection_index: Dict[str, Any], 
                                         expected_detection: str) -> float:
         """Calculate confidence level for correlation"""
         confidence = 0.0
@@ -397,58 +657,54 @@ class PurpleTeamEngine:
         
         # Check for MITRE technique match
         attack_result = attack['result']
-        if attack_result.mitre_technique:
-            for detection in detections:
-                if detection['event'].get('mitre_technique') == attack_result.mitre_technique:
-                    confidence += 0.4
-                    break
+        if attack_result.mitre_technique in detection_index['first_by_mitre']:
+            confidence += 0.4
         
         # Check for temporal proximity
         attack_time = attack['timestamp']
-        for detection in detections:
-            detection_time = detection['timestamp']
-            time_diff = abs(attack_time - detection_time)
-            
-            # Higher confidence for detections within 60 seconds
-            if time_diff <= 60:
-                confidence += 0.3
-                break
-            elif time_diff <= 300:  # 5 minutes
-                confidence += 0.1
-                break
+        
+        # Higher confidence for detections within 60 seconds
+        if self._has_detection_between(detection_index, attack_time - 60, attack_time + 60):
+            confidence += 0.3
+        elif self._has_detection_between(detection_index, attack_time - 300, attack_time + 300):  # 5 minutes
+            confidence += 0.1
         
         return min(confidence, 1.0)
     
+    def _has_detection_between(self, detection_index: Dict[str, Any], start: float, end: float) -> bool:
+        """Check whether any detection timestamp falls within [start, end]"""
+        sorted_times = detection_index['sorted_times']
+        return bisect.bisect_left(sorted_times, start) < bisect.bisect_right(sorted_times, end)
+    
     def _analyze_coverage(self, correlations: List[CorrelationResult]) -> CoverageAnalysis:
         """Analyze detection coverage"""
         total_attacks = len(correlations)
-        detected_attacks = sum(1 for corr in correlations if corr.detected)
-        false_positives = sum(1 for corr in correlations if corr.false_positive)
-        false_negatives = sum(1 for corr in correlations if not corr.detected)
+        detected_attacks = 0
+        false_positives = 0
+        mitre_coverage = defaultdict(lambda: {'total': 0, 'detected': 0, 'coverage': 0.0})
         
-        coverage_percentage = (detected_attacks / total_attacks * 100) if total_attacks > 0 else 0
-        accuracy = ((detected_attacks - false_positives) / total_attacks * 100) if total_attacks > 0 else 0
-        
-        # Analyze MITRE technique coverage
-        mitre_coverage = {}
+        # Count detections, false positives and per-technique coverage in one pass
         for corr in correlations:
+            detected = corr.detected
+            if detected:
+                detected_attacks += 1
+            if corr.false_positive:
+                false_positives += 1
+            
             if corr.mitre_technique:
-                if corr.mitre_technique not in mitre_coverage:
-                    mitre_coverage[corr.mitre_technique] = {
-                        'total': 0,
-                        'detected': 0,
-                        'coverage': 0.0
-                    }
-                
-                mitre_coverage[corr.mitre_technique]['total'] += 1
-                if corr.detected:
-                    mitre_coverage[corr.mitre_technique]['detected'] += 1
+                technique_coverage = mitre_coverage[corr.mitre_technique]
+                technique_coverage['total'] += 1
+                if detected:
+                    technique_coverage['detected'] += 1
+        
+        false_negatives = total_attacks - detected_attacks
+        
+        coverage_percentage = (detected_attacks / total_attacks * 100) if total_attacks > 0 else 0
+        accuracy = ((detected_attacks - false_positives) / total_attacks * 100) if total_attacks > 0 else 0
         
-        # Calculate coverage for each MITRE technique
-        for technique in mitre_coverage:
-            total = mitre_coverage[technique]['total']
-            detected = mitre_coverage[technique]['detected']
-            mitre_coverage[technique]['coverage'] = (detected / total * 100) if total > 0 else 0
+        # Calculate coverage for each MITRE technique (every entry has total >= 1)
+        for technique_coverage in mitre_coverage.values():
+            technique_coverage['coverage'] = technique_coverage['detected'] / technique_coverage['total'] * 100
         
         # Generate recommendations
         recommendations = []
@@ -469,23 +725,28 @@ class PurpleTeamEngine:
             false_positives=false_positives,
             false_negatives=false_negatives,
             accuracy=accuracy,
-            mitre_coverage=mitre_coverage,
+            mitre_coverage=dict(mitre_coverage),
             recommendations=recommendations,
             score=score
         )
     
-    def generate_report(self, results: Dict[str, Any], format: str = 'html') -> str:
-        """Generate a report in the specified format"""
+    def generate_report(self, results: Dict[str, Any], format: str = 'html', *, out=None) -> Optional[str]:
+        """Generate a report in the specified format, writing it to out when a text file object is given"""
         if format == 'json':
-            return json.dumps(results, indent=2, default=str)
+            report = _dumps_json(results)
         elif format == 'csv':
-            return self._generate_csv_report(results)
+            report = self._generate_csv_report(results)
         elif format == 'html':
-            return self._generate_html_report(results)
+            return self._generate_html_report(results, out)
         elif format == 'pdf':
-            return self._generate_pdf_report(results)
+            return self._generate_pdf_report(results, out)
         else:
             raise ValueError(f"Unsupported report format: {format}")
+        
+        if out is not None:
+            out.write(report)
+            return None
+        return report
     
     def _generate_csv_report(self, results: Dict[str, Any]) -> str:
         """Generate CSV report"""
@@ -495,159 +756,51 @@ class PurpleTeamEngine:
         if not correlations:
             return "No correlation data available"
         
-        # Convert to DataFrame
-        df = pd.DataFrame(correlations)
-        
-        # Add coverage summary
-        coverage = results['purple_logic']['coverage']
-        summary_data = {
-            'metric': ['Total Attacks', 'Detected Attacks', 'Coverage %', 'Score'],
-            'value': [
-                coverage['total_attacks'],
-                coverage['detected_attacks'],
-                f"{coverage['coverage_percentage']:.1f}",
-                f"{coverage['score']:.1f}"
-            ]
-        }
-        summary_df = pd.DataFrame(summary_data)
-        
-        # Combine data
-        output = f"Purple Team Report - {results['scenario_name']}\n"
-        output += f"Execution Time: {results['execution_time']}\n\n"
-        output += "Coverage Summary:\n"
-        output += summary_df.to_csv(index=False)
-        output += "\n\nCorrelation Details:\n"
-        output += df.to_csv(index=False)
-        
-        return output
-    
-    def _generate_html_report(self, results: Dict[str, Any]) -> str:
-        """Generate HTML report"""
-        template_str = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Purple Team Report - {{ scenario_name }}</title>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 20px; }
-        .header { background-color: #f0f0f0; padding: 20px; border-radius: 5px; }
-        .section { margin: 20px 0; }
-        .metric { display: inline-block; margin: 10px; padding: 10px; background-color: #e8f4f8; border-radius: 5px; }
-        .score { font-size: 24px; font-weight: bold; color: #2c5aa0; }
-        .coverage { font-size: 20px; color: #28a745; }
-        .warning { color: #dc3545; }
-        .success { color: #28a745; }
-        table { width: 100%; border-collapse: collapse; margin: 10px 0; }
-        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
-        th { background-color: #f2f2f2; }
-        .detected { background-color: #d4edda; }
-        .not-detected { background-color: #f8d7da; }
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>Purple Team Report</h1>
-        <h2>{{ scenario_name }}</h2>
-        <p>Execution Time: {{ execution_time }}</p>
-    </div>
-    
-    <div class="section">
-        <h3>Coverage Summary</h3>
-        <div class="metric">
-            <div class="score">{{ "%.1f"|format(coverage.score) }}/100</div>
-            <div>Overall Score</div>
-        </div>
-        <div class="metric">
-            <div class="coverage">{{ "%.1f"|format(coverage.coverage_percentage) }}%</div>
-            <div>Detection Coverage</div>
-        </div>
-        <div class="metric">
-            <div>{{ coverage.total_attacks }}</div>
-            <div>Total Attacks</div>
-        </div>
-        <div class="metric">
-            <div>{{ coverage.detected_attacks }}</div>
-            <div>Detected Attacks</div>
-        </div>
-    </div>
-    
-    <div class="section">
-        <h3>Correlation Results</h3>
-        <table>
-            <tr>
-                <th>Attack Technique</th>
-                <th>Expected Detection</th>
-                <th>Actual Detection</th>
-                <th>Detected</th>
-                <th>MITRE Technique</th>
-                <th>Confidence</th>
-            </tr>
-            {% for corr in correlations %}
-            <tr class="{{ 'detected' if corr.detected else 'not-detected' }}">
-                <td>{{ corr.attack_technique }}</td>
-                <td>{{ corr.expected_detection }}</td>
-                <td>{{ corr.actual_detection or 'None' }}</td>
-                <td>{{ 'Yes' if corr.detected else 'No' }}</td>
-                <td>{{ corr.mitre_technique or 'N/A' }}</td>
-                <td>{{ "%.1f"|format(corr.confidence * 100) }}%</td>
-            </tr>
-            {% endfor %}
-        </table>
-    </div>
-    
-    {% if coverage.recommendations %}
-    <div class="section">
-        <h3>Recommendations</h3>
-        <ul>
-            {% for rec in coverage.recommendations %}
-            <li class="warning">{{ rec }}</li>
-            {% endfor %}
-        </ul>
-    </div>
-    {% endif %}
-</body>
-</html>
-        """
+        coverage = _as_record(results['purple_logic']['coverage'])
         
-        template = Template(template_str)
-        return template.render(
+        output = io.StringIO()
+        output.write(f"Purple Team Report - {results['scenario_name']}\n")
+        output.write(f"Execution Time: {results['execution_time']}\n\n")
+        output.write("Coverage Summary:\n")
+        
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(['metric', 'value'])
+        writer.writerows([
+            ['Total Attacks', coverage['total_attacks']],
+            ['Detected Attacks', coverage['detected_attacks']],
+            ['Coverage %', f"{coverage['coverage_percentage']:.1f}"],
+            ['Score', f"{coverage['score']:.1f}"]
+        ])
+        
+        output.write("\n\nCorrelation Details:\n")
+        
+        # Columns in order of first appearance across all correlations
+        correlations = [_as_record(corr) for corr in correlations]
+        header = list(dict.fromkeys(key for corr in correlations for key in corr))
+        writer.writerow(header)
+        writer.writerows([corr.get(key, '') for key in header] for corr in correlations)
+        
+        return output.getvalue()
+    
+    def _generate_html_report(self, results: Dict[str, Any], out=None) -> Optional[str]:
+        """Generate HTML report, streaming it into out when a file object is given"""
+        stream = _html_report_template().stream(
             scenario_name=results['scenario_name'],
             execution_time=results['execution_time'],
             coverage=results['purple_logic']['coverage'],
-            correlations=results['purple_logic']['correlations']
+            correlation_rows=_correlation_rows_html(results['purple_logic']['correlations'])
         )
+        
+        if out is not None:
+            stream.dump(out)
+            return None
+        
+        buffer = io.StringIO()
+        stream.dump(buffer)
+        return buffer.getvalue()
     
-    def _generate_pdf_report(self, results: Dict[str, Any]) -> str:
+    def _generate_pdf_report(self, results: Dict[str, Any], out=None) -> Optional[str]:
         """Generate PDF report (placeholder)"""
         # This would use a library like reportlab or weasyprint
         # For now, return HTML that can be converted to PDF
-        return self._generate_html_report(results)
-    
-    def _correlation_to_dict(self, correlation: CorrelationResult) -> Dict[str, Any]:
-        """Convert correlation result to dictionary"""
-        return {
-            'attack_technique': correlation.attack_technique,
-            'expected_detection': correlation.expected_detection,
-            'actual_detection': correlation.actual_detection,
-            'detected': correlation.detected,
-            'detection_time': correlation.detection_time,
-            'false_positive': correlation.false_positive,
-            'false_negative': correlation.false_negative,
-            'mitre_technique': correlation.mitre_technique,
-            'confidence': correlation.confidence,
-            'details': correlation.details
-        }
-    
-    def _coverage_to_dict(self, coverage: CoverageAnalysis) -> Dict[str, Any]:
-        """Convert coverage analysis to dictionary"""
-        return {
-            'total_attacks': coverage.total_attacks,
-            'detected_attacks': coverage.detected_attacks,
-            'coverage_percentage': coverage.coverage_percentage,
-            'false_positives': coverage.false_positives,
-            'false_negatives': coverage.false_negatives,
-            'accuracy': coverage.accuracy,
-            'mitre_coverage': coverage.mitre_coverage,
-            'recommendations': coverage.recommendations,
-            'score': coverage.score
-        }
+        return self._generate_html_report(results, out)
@@ -5,6 +5,8 @@ Provides attack simulation capabilities including reconnaissance,
 exploitation, and post-exploitation activities.
 """
 
+from functools import cached_property
+
 from .modules import ReconnaissanceModule, ExploitationModule, PostExploitationModule
 from .payloads import PayloadManager
 
@@ -14,10 +16,23 @@ class RedTeamModule:
     
     def __init__(self, config=None):
         self.config = config or {}
-        self.reconnaissance = ReconnaissanceModule(self.config)
-        self.exploitation = ExploitationModule(self.config)
-        self.post_exploitation = PostExploitationModule(self.config)
-        self.payload_manager = PayloadManager(self.config)
+    
+    # Sub-modules are built on first use so commands only pay for what they run
+    @cached_property
+    def reconnaissance(self):
+        return ReconnaissanceModule(self.config)
+    
+    @cached_property
+    def exploitation(self):
+        return ExploitationModule(self.config)
+    
+    @cached_property
+    def post_exploitation(self):
+        return PostExploitationModule(self.config)
+    
+    @cached_property
+    def payload_manager(self):
+        return PayloadManager(self.config)
 
 __all__ = [
     "ReconnaissanceModule",
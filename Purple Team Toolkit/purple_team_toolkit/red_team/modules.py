@@ -4,21 +4,65 @@ Red Team Attack Modules
 Provides various attack simulation capabilities for Purple Team testing.
 """
 
+import asyncio
+import copy
+import functools
 import nmap
+import dns.asyncresolver
 import dns.resolver
 import whois
 import requests
+from requests.adapters import HTTPAdapter
 import time
+import json
 import logging
-from typing import Dict, List, Any, Optional
+import os
+import shutil
+import sys
+import tempfile
+from typing import Dict, List, Any, Optional, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 import subprocess
 import socket
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
-@dataclass
+# Common record types
+DNS_RECORD_TYPES = ('A', 'AAAA', 'MX', 'NS', 'TXT')
+
+# Subdomains probed during DNS enumeration
+DEFAULT_SUBDOMAINS = (
+    'www', 'mail', 'ftp', 'admin', 'blog', 'dev', 'test',
+    'api', 'cdn', 'static', 'img', 'images', 'support'
+)
+
+# Paths requested by web fuzzing when no wordlist is given
+DEFAULT_FUZZ_PATHS = (
+    'admin', 'login', 'wp-admin', 'phpmyadmin', 'config',
+    'backup', 'test', 'dev', 'api', 'v1', 'v2', 'docs'
+)
+
+# WHOIS and DNS answers are reused for the same target for this many seconds
+RECON_CACHE_TTL = 3600
+RECON_CACHE_SIZE = 1024
+
+# (technique, target) -> (monotonic expiry, result data), shared by all modules in the process
+_RECON_CACHE: Dict[tuple, tuple] = {}
+# Red-team activities run on a thread pool, so every cache access holds this lock
+_RECON_CACHE_LOCK = threading.Lock()
+
+# Fields kept from a WHOIS record
+WHOIS_FIELDS = (
+    'domain_name', 'registrar', 'creation_date', 'expiration_date',
+    'updated_date', 'name_servers', 'status', 'emails'
+)
+
+# Seconds to wait for a TCP handshake before reporting a port as filtered
+PORT_SCAN_TIMEOUT = 2
+# Maximum connection attempts in flight during a port scan
+PORT_SCAN_CONCURRENCY = 256
+
+@dataclass(slots=True)
 class AttackResult:
     """Result of an attack execution"""
     technique: str
@@ -28,6 +72,35 @@ class AttackResult:
     timestamp: float
     mitre_technique: Optional[str] = None
     description: str = ""
+    
+    def __post_init__(self):
+        # Technique names come from a small fixed set; share one string object per name
+        self.technique = sys.intern(self.technique)
+        self.mitre_technique = sys.intern(self.mitre_technique) if self.mitre_technique else None
+
+def _cached_recon(technique: str, target: str, lookup) -> Dict[str, Any]:
+    """Return recent reconnaissance data for a target, running lookup(target) on a miss"""
+    key = (technique, target)
+    with _RECON_CACHE_LOCK:
+        entry = _RECON_CACHE.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return copy.deepcopy(entry[1])
+    
+    # The lookup runs outside the lock so slow network calls do not serialize the pool
+    data = lookup(target)
+    # Callers get their own copy so later mutation cannot leak into the cache
+    cached = copy.deepcopy(data)
+    
+    with _RECON_CACHE_LOCK:
+        if len(_RECON_CACHE) >= RECON_CACHE_SIZE:
+            now = time.monotonic()
+            for stale in [k for k, (expires_at, _) in _RECON_CACHE.items() if expires_at <= now]:
+                del _RECON_CACHE[stale]
+            if len(_RECON_CACHE) >= RECON_CACHE_SIZE:
+                del _RECON_CACHE[next(iter(_RECON_CACHE))]
+        
+        _RECON_CACHE[key] = (time.monotonic() + RECON_CACHE_TTL, cached)
+    return data
 
 class ReconnaissanceModule:
     """Network and target reconnaissance capabilities"""
@@ -35,13 +108,20 @@ class ReconnaissanceModule:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.logger = logging.getLogger(__name__)
+    
+    @functools.cached_property
+    def nm(self) -> Optional[nmap.PortScanner]:
+        """nmap scanner, created on first use since PortScanner() runs the nmap binary"""
         try:
-            self.nm = nmap.PortScanner()
-            self.nmap_available = True
+            return nmap.PortScanner()
         except Exception as e:
             self.logger.warning(f"Nmap not available: {e}")
-            self.nm = None
-            self.nmap_available = False
+            return None
+    
+    @functools.cached_property
+    def nmap_available(self) -> bool:
+        """Whether an nmap binary could be found"""
+        return self.nm is not None
     
     def nmap_scan(self, target: str, scan_type: str = "basic") -> AttackResult:
         """Perform network scanning using nmap"""
@@ -76,20 +156,21 @@ class ReconnaissanceModule:
             }
             
             for host in self.nm.all_hosts():
+                # Look each host up once and walk its protocol dicts directly
+                host_data = self.nm[host]
                 results['hosts'][host] = {
-                    'state': self.nm[host].state(),
-                    'ports': {}
-                }
-                
-                for proto in self.nm[host].all_protocols():
-                    ports = self.nm[host][proto].keys()
-                    for port in ports:
-                        results['hosts'][host]['ports'][port] = {
-                            'state': self.nm[host][proto][port]['state'],
-                            'service': self.nm[host][proto][port]['name'],
-                            'version': self.nm[host][proto][port].get('version', ''),
-                            'product': self.nm[host][proto][port].get('product', '')
+                    'state': host_data.state(),
+                    'ports': {
+                        port: {
+                            'state': port_data['state'],
+                            'service': port_data['name'],
+                            'version': port_data.get('version', ''),
+                            'product': port_data.get('product', '')
                         }
+                        for proto in host_data.all_protocols()
+                        for port, port_data in host_data[proto].items()
+                    }
+                }
             
             return AttackResult(
                 technique="nmap_scan",
@@ -118,42 +199,7 @@ class ReconnaissanceModule:
         try:
             self.logger.info(f"Starting DNS enumeration of {domain}")
             
-            results = {
-                'a_records': [],
-                'aaaa_records': [],
-                'mx_records': [],
-                'ns_records': [],
-                'txt_records': [],
-                'subdomains': []
-            }
-            
-            # Common record types
-            record_types = ['A', 'AAAA', 'MX', 'NS', 'TXT']
-            
-            for record_type in record_types:
-                try:
-                    answers = dns.resolver.resolve(domain, record_type)
-                    for answer in answers:
-                        results[f'{record_type.lower()}_records'].append(str(answer))
-                except Exception as e:
-                    self.logger.debug(f"Failed to resolve {record_type} records: {e}")
-            
-            # Subdomain enumeration
-            common_subdomains = [
-                'www', 'mail', 'ftp', 'admin', 'blog', 'dev', 'test',
-                'api', 'cdn', 'static', 'img', 'images', 'support'
-            ]
-            
-            for subdomain in common_subdomains:
-                try:
-                    full_domain = f"{subdomain}.{domain}"
-                    answers = dns.resolver.resolve(full_domain, 'A')
-                    results['subdomains'].append({
-                        'subdomain': subdomain,
-                        'ip': str(answers[0])
-                    })
-                except Exception:
-                    pass
+            results = _cached_recon('dns_enumeration', domain, self._enumerate_dns)
             
             return AttackResult(
                 technique="dns_enumeration",
@@ -177,28 +223,100 @@ class ReconnaissanceModule:
                 description=f"DNS enumeration failed: {e}"
             )
     
+    def _enumerate_dns(self, domain: str) -> Dict[str, Any]:
+        """Resolve the common record types and subdomains of a domain"""
+        results = {
+            'a_records': [],
+            'aaaa_records': [],
+            'mx_records': [],
+            'ns_records': [],
+            'txt_records': [],
+            'subdomains': []
+        }
+        
+        record_types = DNS_RECORD_TYPES
+        common_subdomains = DEFAULT_SUBDOMAINS
+        
+        # Hand subdomains to massdns when it is installed; resolve them here otherwise
+        bulk_subdomains = self._massdns_subdomains(domain, common_subdomains)
+        
+        record_answers, subdomain_answers = asyncio.run(
+            self._resolve_all(domain, record_types, common_subdomains if bulk_subdomains is None else [])
+        )
+        
+        for record_type, answers in zip(record_types, record_answers):
+            if isinstance(answers, Exception):
+                self.logger.debug(f"Failed to resolve {record_type} records: {answers}")
+                continue
+            for answer in answers:
+                results[f'{record_type.lower()}_records'].append(str(answer))
+        
+        if bulk_subdomains is not None:
+            results['subdomains'] = bulk_subdomains
+        
+        for subdomain, answers in zip(common_subdomains, subdomain_answers):
+            if not isinstance(answers, Exception):
+                results['subdomains'].append({
+                    'subdomain': subdomain,
+                    'ip': str(answers[0])
+                })
+        
+        return results
+    
+    async def _resolve_all(self, domain: str, record_types: Sequence[str], subdomains: Sequence[str]) -> tuple:
+        """Issue every record and subdomain query concurrently; failed queries come back as exceptions"""
+        record_queries = [dns.asyncresolver.resolve(domain, record_type) for record_type in record_types]
+        subdomain_queries = [dns.asyncresolver.resolve(f"{subdomain}.{domain}", 'A') for subdomain in subdomains]
+        
+        answers = await asyncio.gather(*record_queries, *subdomain_queries, return_exceptions=True)
+        return answers[:len(record_queries)], answers[len(record_queries):]
+    
+    def _massdns_subdomains(self, domain: str, subdomains: Sequence[str]) -> Optional[List[Dict[str, str]]]:
+        """Resolve subdomain A records in bulk with massdns, or return None if it cannot be used"""
+        massdns = shutil.which('massdns')
+        if massdns is None:
+            return None
+        
+        nameservers = dns.resolver.get_default_resolver().nameservers
+        
+        try:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                resolvers_file = Path(tmp_dir) / 'resolvers.txt'
+                resolvers_file.write_text('\n'.join(nameservers) + '\n')
+                names_file = Path(tmp_dir) / 'names.txt'
+                names_file.write_text(''.join(f"{subdomain}.{domain}\n" for subdomain in subdomains))
+                
+                completed = subprocess.run(
+                    [massdns, '-r', str(resolvers_file), '-t', 'A', '-o', 'J', '-q', str(names_file)],
+                    capture_output=True, timeout=30, check=True
+                )
+        except (OSError, subprocess.SubprocessError) as e:
+            self.logger.debug(f"massdns failed, resolving subdomains directly: {e}")
+            return None
+        
+        # massdns prints one JSON object per answered query
+        ips = {}
+        for line in completed.stdout.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            answers = [answer for answer in record.get('data', {}).get('answers', []) if answer.get('type') == 'A']
+            if answers:
+                ips.setdefault(record.get('name', '').rstrip('.').lower(), answers[0]['data'])
+        
+        return [
+            {'subdomain': subdomain, 'ip': ips[f"{subdomain}.{domain}".lower()]}
+            for subdomain in subdomains
+            if f"{subdomain}.{domain}".lower() in ips
+        ]
+    
     def whois_lookup(self, target: str) -> AttackResult:
         """Perform WHOIS lookup"""
         try:
             self.logger.info(f"Starting WHOIS lookup for {target}")
             
-            # Try different ways to call whois
-            try:
-                w = whois.whois(target)
-            except AttributeError:
-                # Fallback for different whois package versions
-                w = whois.query(target)
-            
-            results = {
-                'domain_name': w.domain_name,
-                'registrar': w.registrar,
-                'creation_date': str(w.creation_date),
-                'expiration_date': str(w.expiration_date),
-                'updated_date': str(w.updated_date),
-                'name_servers': w.name_servers,
-                'status': w.status,
-                'emails': w.emails
-            }
+            results = _cached_recon('whois_lookup', target, self._query_whois)
             
             return AttackResult(
                 technique="whois_lookup",
@@ -221,6 +339,24 @@ class ReconnaissanceModule:
                 mitre_technique="T1590",
                 description=f"WHOIS lookup failed: {e}"
             )
+    
+    def _query_whois(self, target: str) -> Dict[str, Any]:
+        """Fetch the WHOIS record of a target"""
+        # Try different ways to call whois
+        try:
+            w = whois.whois(target)
+        except AttributeError:
+            # Fallback for different whois package versions
+            w = whois.query(target)
+        
+        # WhoisEntry is a dict; read it directly rather than through its
+        # attribute lookup, and only fall back to getattr for other record types
+        raw = w if isinstance(w, dict) else {field: getattr(w, field, None) for field in WHOIS_FIELDS}
+        
+        return {
+            field: str(raw.get(field)) if field.endswith('_date') else raw.get(field)
+            for field in WHOIS_FIELDS
+        }
 
 class ExploitationModule:
     """Exploitation testing capabilities"""
@@ -235,10 +371,7 @@ class ExploitationModule:
             self.logger.info(f"Starting web fuzzing of {target}")
             
             if not wordlist:
-                wordlist = [
-                    'admin', 'login', 'wp-admin', 'phpmyadmin', 'config',
-                    'backup', 'test', 'dev', 'api', 'v1', 'v2', 'docs'
-                ]
+                wordlist = DEFAULT_FUZZ_PATHS
             
             results = {
                 'found_paths': [],
@@ -246,25 +379,10 @@ class ExploitationModule:
                 'errors': []
             }
             
-            for path in wordlist:
-                try:
-                    url = f"{target.rstrip('/')}/{path}"
-                    response = requests.get(url, timeout=10, allow_redirects=False)
-                    
-                    if response.status_code != 404:
-                        results['found_paths'].append({
-                            'path': path,
-                            'url': url,
-                            'status_code': response.status_code,
-                            'content_length': len(response.content)
-                        })
-                        
-                        if response.status_code not in results['status_codes']:
-                            results['status_codes'][response.status_code] = 0
-                        results['status_codes'][response.status_code] += 1
-                        
-                except Exception as e:
-                    results['errors'].append(f"Error testing {path}: {e}")
+            # Reuse one keep-alive connection for every path instead of a handshake per request
+            with requests.Session() as session:
+                session.mount(target, HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0))
+                self._fuzz_paths(session, target, wordlist, results)
             
             return AttackResult(
                 technique="web_fuzzing",
@@ -288,6 +406,28 @@ class ExploitationModule:
                 description=f"Web fuzzing failed: {e}"
             )
     
+    def _fuzz_paths(self, session: requests.Session, target: str, wordlist: Sequence[str], results: Dict[str, Any]):
+        """Request each wordlist path on the target and record the ones that exist"""
+        for path in wordlist:
+            try:
+                url = f"{target.rstrip('/')}/{path}"
+                response = session.get(url, timeout=10, allow_redirects=False)
+                
+                if response.status_code != 404:
+                    results['found_paths'].append({
+                        'path': path,
+                        'url': url,
+                        'status_code': response.status_code,
+                        'content_length': len(response.content)
+                    })
+                    
+                    if response.status_code not in results['status_codes']:
+                        results['status_codes'][response.status_code] = 0
+                    results['status_codes'][response.status_code] += 1
+            
+            except Exception as e:
+                results['errors'].append(f"Error testing {path}: {e}")
+
     def port_scan(self, target: str, ports: Optional[List[int]] = None) -> AttackResult:
         """Perform port scanning"""
         try:
@@ -302,27 +442,13 @@ class ExploitationModule:
                 'filtered_ports': []
             }
             
-            def scan_port(port):
-                try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(2)
-                    result = sock.connect_ex((target, port))
-                    sock.close()
-                    
-                    if result == 0:
-                        return port, 'open'
-                    else:
-                        return port, 'closed'
-                except Exception:
-                    return port, 'filtered'
+            # Half-open SYN scan when raw sockets are available, full TCP connects otherwise
+            statuses = self._syn_scan(target, ports)
+            if statuses is None:
+                statuses = asyncio.run(self._scan_ports(target, ports))
             
-            # Use thread pool for concurrent scanning
-            with ThreadPoolExecutor(max_workers=10) as executor:
-                future_to_port = {executor.submit(scan_port, port): port for port in ports}
-                
-                for future in as_completed(future_to_port):
-                    port, status = future.result()
-                    results[f'{status}_ports'].append(port)
+            for port, status in statuses:
+                results[f'{status}_ports'].append(port)
             
             return AttackResult(
                 technique="port_scan",
@@ -345,6 +471,62 @@ class ExploitationModule:
                 mitre_technique="T1046",
                 description=f"Port scan failed: {e}"
             )
+    
+    def _syn_scan(self, target: str, ports: List[int]) -> Optional[List[tuple]]:
+        """SYN-scan ports with scapy, or return None when not running as root or scapy is missing"""
+        geteuid = getattr(os, 'geteuid', None)
+        if geteuid is None or geteuid() != 0:
+            return None
+        
+        try:
+            from scapy.all import IP, TCP, sr
+        except ImportError:
+            return None
+        
+        try:
+            answered, _ = sr(IP(dst=target) / TCP(dport=list(ports), flags='S'), timeout=PORT_SCAN_TIMEOUT, verbose=0)
+        except OSError as e:
+            self.logger.debug(f"SYN scan unavailable, falling back to connect scan: {e}")
+            return None
+        
+        # Unanswered probes and ICMP errors mean the port is filtered
+        statuses = dict.fromkeys(ports, 'filtered')
+        for sent, received in answered:
+            if received.haslayer(TCP):
+                flags = int(received[TCP].flags)
+                if flags & 0x12 == 0x12:
+                    statuses[sent[TCP].dport] = 'open'
+                elif flags & 0x04:
+                    statuses[sent[TCP].dport] = 'closed'
+        
+        return list(statuses.items())
+    
+    async def _scan_ports(self, target: str, ports: List[int]) -> List[tuple]:
+        """Probe all ports concurrently on one event loop, returning (port, status) in port order"""
+        # Resolve the target once instead of once per port; works for IPv4 and IPv6 alike
+        addresses = await asyncio.get_running_loop().getaddrinfo(target, None, type=socket.SOCK_STREAM)
+        host = addresses[0][4][0]
+        
+        # Bound open sockets so large port ranges stay under the file descriptor limit
+        slots = asyncio.Semaphore(PORT_SCAN_CONCURRENCY)
+        
+        async def scan_port(port):
+            async with slots:
+                try:
+                    _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), PORT_SCAN_TIMEOUT)
+                except ConnectionRefusedError:
+                    return port, 'closed'
+                except (asyncio.TimeoutError, OSError):
+                    return port, 'filtered'
+                
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except OSError:
+                    pass
+                return port, 'open'
+        
+        return await asyncio.gather(*(scan_port(port) for port in ports))
 
 class PostExploitationModule:
     """Post-exploitation simulation capabilities"""
@@ -9,13 +9,49 @@ import base64
 import hashlib
 import time
 import logging
+import operator
+import secrets
+import sys
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-import random
-import string
 
-@dataclass
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Web attack type -> (content, description, MITRE technique); {target} is filled in per payload
+WEB_PAYLOAD_TEMPLATES = {
+    'xss': ("<script>alert('{target}')</script>", "XSS payload targeting {target}", "T1189"),
+    'sqli': ("' UNION SELECT 1,2,3--", "SQL injection payload", "T1190"),
+    'lfi': ("../../../etc/passwd", "Local file inclusion payload", "T1190")
+}
+DEFAULT_WEB_PAYLOAD_TEMPLATE = ("<!-- {target} test payload -->", "Generic web payload for {target}", "T1190")
+
+# Network scan type -> (content, description, MITRE technique); unknown types fall back to a ping
+NETWORK_PAYLOAD_TEMPLATES = {
+    'port': ("nmap -sS -p {ports} {target}", "Port scan of {target}", "T1046"),
+    'dns': ("nslookup {target}", "DNS query for {target}", "T1590")
+}
+DEFAULT_NETWORK_PAYLOAD_TEMPLATE = ("ping -c 1 {target}", "Ping test for {target}", "T1046")
+
+# Filesystem operation -> (content, description, MITRE technique); unknown operations fall back to stat
+FILESYSTEM_PAYLOAD_TEMPLATES = {
+    'read': ("cat {path}", "File read operation: {path}", "T1005"),
+    'list': ("ls -la {path}", "Directory listing: {path}", "T1083")
+}
+DEFAULT_FILESYSTEM_PAYLOAD_TEMPLATE = ("stat {path}", "File stat operation: {path}", "T1005")
+
+# Auth test type -> (content, description, MITRE technique); unknown types test the bare username
+AUTH_PAYLOAD_TEMPLATES = {
+    'password': ("{username}:{password}", "Password test for {username}", "T1110"),
+    'token': ("Bearer {token}", "Token-based auth test", "T1078")
+}
+DEFAULT_AUTH_PAYLOAD_TEMPLATE = ("{username}:", "Username test: {username}", "T1078")
+
+@dataclass(slots=True, frozen=True)
 class Payload:
     """Represents a test payload"""
     name: str
@@ -25,18 +61,133 @@ class Payload:
     mitre_technique: Optional[str] = None
     risk_level: str = "LOW"
     sandbox_safe: bool = True
-    hash: Optional[str] = None
+    # SHA256 of content; computed on first access when not given
+    hash: Optional[str] = field(default=None, compare=False)
     created_at: float = None
     
     def __post_init__(self):
+        # Frozen instances are normalised through object.__setattr__
         if self.created_at is None:
-            self.created_at = time.time()
+            object.__setattr__(self, 'created_at', time.time())
         if self.hash is None:
-            self.hash = self._calculate_hash()
+            # Leave the slot empty so the first read falls through to __getattr__
+            object.__delattr__(self, 'hash')
+        # Types, techniques and risk levels repeat across payloads; share one string object each
+        object.__setattr__(self, 'type', sys.intern(self.type))
+        object.__setattr__(self, 'risk_level', sys.intern(self.risk_level))
+        if self.mitre_technique:
+            object.__setattr__(self, 'mitre_technique', sys.intern(self.mitre_technique))
+    
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for an unset slot, i.e. a hash that has not been calculated yet
+        if name != 'hash':
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        value = hashlib.sha256(self.content.encode('utf-8', 'surrogatepass')).hexdigest()
+        object.__setattr__(self, 'hash', value)
+        return value
+
+# Custom payloads remembered per manager for repeated identical requests; cleared when full
+CUSTOM_PAYLOAD_CACHE_SIZE = 256
+
+# Payload files parsed in this process, keyed by a digest of their bytes; cleared when full
+LOADED_PAYLOADS_CACHE_SIZE = 16
+_LOADED_PAYLOADS: Dict[bytes, tuple] = {}
+
+# Keys written per payload by save_payloads
+PAYLOAD_RECORD_FIELDS = (
+    'name', 'type', 'content', 'description', 'mitre_technique',
+    'risk_level', 'sandbox_safe', 'hash', 'created_at'
+)
+_payload_values = operator.attrgetter(*PAYLOAD_RECORD_FIELDS)
+
+def _payload_record(payload: Payload) -> Dict[str, Any]:
+    """JSON record written for a payload by PayloadManager.save_payloads"""
+    if not isinstance(payload, Payload):
+        raise TypeError(f"Object of type {type(payload).__name__} is not JSON serializable")
+    return dict(zip(PAYLOAD_RECORD_FIELDS, _payload_values(payload)))
+
+# Built-in test payloads, constructed once at import and shared by every PayloadManager
+DEFAULT_PAYLOADS = (
+    # Web payloads
+    Payload(
+        name="SQL Injection Test",
+        type="web",
+        content="' OR 1=1--",
+        description="Basic SQL injection test payload",
+        mitre_technique="T1190",
+        risk_level="MEDIUM"
+    ),
+    Payload(
+        name="XSS Test",
+        type="web", 
+        content="<script>alert('XSS Test')</script>",
+        description="Basic XSS test payload",
+        mitre_technique="T1189",
+        risk_level="LOW"
+    ),
+    Payload(
+        name="Command Injection Test",
+        type="web",
+        content="; ls -la",
+        description="Basic command injection test",
+        mitre_technique="T1190",
+        risk_level="MEDIUM"
+    ),
+    
+    # Network payloads
+    Payload(
+        name="Port Scan Payload",
+        type="network",
+        content="nmap -sS -p 80,443,22,21",
+        description="Basic port scan command",
+        mitre_technique="T1046",
+        risk_level="LOW"
+    ),
+    Payload(
+        name="DNS Query Payload",
+        type="network",
+        content="nslookup example.com",
+        description="DNS query test",
+        mitre_technique="T1590",
+        risk_level="LOW"
+    ),
     
-    def _calculate_hash(self) -> str:
-        """Calculate SHA256 hash of payload content"""
-        return hashlib.sha256(self.content.encode()).hexdigest()
+    # File system payloads
+    Payload(
+        name="File Read Test",
+        type="filesystem",
+        content="/etc/passwd",
+        description="Attempt to read system file",
+        mitre_technique="T1005",
+        risk_level="LOW"
+    ),
+    Payload(
+        name="Directory Traversal Test",
+        type="filesystem",
+        content="../../../etc/passwd",
+        description="Directory traversal test",
+        mitre_technique="T1190",
+        risk_level="MEDIUM"
+    ),
+    
+    # Authentication payloads
+    Payload(
+        name="Weak Password Test",
+        type="auth",
+        content="admin:admin",
+        description="Common weak credentials",
+        mitre_technique="T1078",
+        risk_level="LOW"
+    ),
+    Payload(
+        name="Brute Force Test",
+        type="auth",
+        content="admin:password123",
+        description="Common password test",
+        mitre_technique="T1110",
+        risk_level="MEDIUM"
+    )
+)
 
 class PayloadManager:
     """Manages payloads for Red Team operations"""
@@ -45,94 +196,34 @@ class PayloadManager:
         self.config = config
         self.logger = logging.getLogger(__name__)
         self.payloads: Dict[str, Payload] = {}
+        # Secondary indexes kept in step with self.payloads
+        self._by_type: Dict[str, List[Payload]] = defaultdict(list)
+        self._safe: List[Payload] = []
+        # (payload type, parameters) -> first payload generated for them, used as a template
+        self._custom_payloads: Dict[tuple, Payload] = {}
         self._load_default_payloads()
     
     def _load_default_payloads(self):
         """Load default test payloads"""
-        default_payloads = [
-            # Web payloads
-            Payload(
-                name="SQL Injection Test",
-                type="web",
-                content="' OR 1=1--",
-                description="Basic SQL injection test payload",
-                mitre_technique="T1190",
-                risk_level="MEDIUM"
-            ),
-            Payload(
-                name="XSS Test",
-                type="web", 
-                content="<script>alert('XSS Test')</script>",
-                description="Basic XSS test payload",
-                mitre_technique="T1189",
-                risk_level="LOW"
-            ),
-            Payload(
-                name="Command Injection Test",
-                type="web",
-                content="; ls -la",
-                description="Basic command injection test",
-                mitre_technique="T1190",
-                risk_level="MEDIUM"
-            ),
-            
-            # Network payloads
-            Payload(
-                name="Port Scan Payload",
-                type="network",
-                content="nmap -sS -p 80,443,22,21",
-                description="Basic port scan command",
-                mitre_technique="T1046",
-                risk_level="LOW"
-            ),
-            Payload(
-                name="DNS Query Payload",
-                type="network",
-                content="nslookup example.com",
-                description="DNS query test",
-                mitre_technique="T1590",
-                risk_level="LOW"
-            ),
-            
-            # File system payloads
-            Payload(
-                name="File Read Test",
-                type="filesystem",
-                content="/etc/passwd",
-                description="Attempt to read system file",
-                mitre_technique="T1005",
-                risk_level="LOW"
-            ),
-            Payload(
-                name="Directory Traversal Test",
-                type="filesystem",
-                content="../../../etc/passwd",
-                description="Directory traversal test",
-                mitre_technique="T1190",
-                risk_level="MEDIUM"
-            ),
-            
-            # Authentication payloads
-            Payload(
-                name="Weak Password Test",
-                type="auth",
-                content="admin:admin",
-                description="Common weak credentials",
-                mitre_technique="T1078",
-                risk_level="LOW"
-            ),
-            Payload(
-                name="Brute Force Test",
-                type="auth",
-                content="admin:password123",
-                description="Common password test",
-                mitre_technique="T1110",
-                risk_level="MEDIUM"
-            )
-        ]
+        for payload in DEFAULT_PAYLOADS:
+            self._store_payload(payload)
+    
+    def _store_payload(self, payload: Payload):
+        """Store a payload by name and update the type and safety indexes"""
+        previous = self.payloads.get(payload.name)
+        if previous is not None:
+            self._unindex_payload(previous)
         
-        for payload in default_payloads:
-            self.payloads[payload.name] = payload
+        self.payloads[payload.name] = payload
+        self._by_type[payload.type].append(payload)
+        if payload.sandbox_safe:
+            self._safe.append(payload)
+    
+    def _unindex_payload(self, payload: Payload):
+        """Drop a payload from the type and safety indexes"""
+        self._by_type[payload.type].remove(payload)
+        if payload.sandbox_safe:
+            self._safe.remove(payload)
     
     def get_payload(self, name: str) -> Optional[Payload]:
         """Get a payload by name"""
@@ -140,21 +231,21 @@ class PayloadManager:
     
     def get_payloads_by_type(self, payload_type: str) -> List[Payload]:
         """Get all payloads of a specific type"""
-        return [p for p in self.payloads.values() if p.type == payload_type]
+        return list(self._by_type.get(payload_type, ()))
     
     def get_safe_payloads(self) -> List[Payload]:
         """Get all sandbox-safe payloads"""
-        return [p for p in self.payloads.values() if p.sandbox_safe]
+        return list(self._safe)
     
     def add_payload(self, payload: Payload):
         """Add a new payload"""
-        self.payloads[payload.name] = payload
+        self._store_payload(payload)
         self.logger.info(f"Added payload: {payload.name}")
     
     def remove_payload(self, name: str) -> bool:
         """Remove a payload by name"""
         if name in self.payloads:
-            del self.payloads[name]
+            self._unindex_payload(self.payloads.pop(name))
             self.logger.info(f"Removed payload: {name}")
             return True
         return False
@@ -175,45 +266,41 @@ class PayloadManager:
     
     def generate_custom_payload(self, payload_type: str, **kwargs) -> Payload:
         """Generate a custom payload based on type and parameters"""
-        
-        if payload_type == "web":
-            return self._generate_web_payload(**kwargs)
-        elif payload_type == "network":
-            return self._generate_network_payload(**kwargs)
-        elif payload_type == "filesystem":
-            return self._generate_filesystem_payload(**kwargs)
-        elif payload_type == "auth":
-            return self._generate_auth_payload(**kwargs)
-        else:
+        generator = self._GENERATORS.get(payload_type)
+        if generator is None:
             raise ValueError(f"Unknown payload type: {payload_type}")
+        if payload_type == 'auth' and kwargs.get('auth_type') == 'token':
+            # Every token payload carries a fresh random token
+            return generator(self, **kwargs)
+        
+        try:
+            key = (payload_type, frozenset(kwargs.items()))
+            payload = self._custom_payloads.get(key)
+        except TypeError:
+            # Unhashable parameters (e.g. a list of ports) are generated every time
+            return generator(self, **kwargs)
+        
+        if payload is None:
+            payload = generator(self, **kwargs)
+            if len(self._custom_payloads) >= CUSTOM_PAYLOAD_CACHE_SIZE:
+                self._custom_payloads.clear()
+            self._custom_payloads[key] = payload
+            return payload
+        # Reuse the rendered fields and hash, but each request still gets its own creation time
+        return replace(payload, created_at=time.time())
     
     def _generate_web_payload(self, **kwargs) -> Payload:
         """Generate web-based payload"""
         attack_type = kwargs.get('attack_type', 'xss')
         target = kwargs.get('target', 'test')
         
-        if attack_type == 'xss':
-            content = f"<script>alert('{target}')</script>"
-            description = f"XSS payload targeting {target}"
-            mitre_technique = "T1189"
-        elif attack_type == 'sqli':
-            content = f"' UNION SELECT 1,2,3--"
-            description = f"SQL injection payload"
-            mitre_technique = "T1190"
-        elif attack_type == 'lfi':
-            content = f"../../../etc/passwd"
-            description = f"Local file inclusion payload"
-            mitre_technique = "T1190"
-        else:
-            content = f"<!-- {target} test payload -->"
-            description = f"Generic web payload for {target}"
-            mitre_technique = "T1190"
+        content, description, mitre_technique = WEB_PAYLOAD_TEMPLATES.get(attack_type, DEFAULT_WEB_PAYLOAD_TEMPLATE)
         
         return Payload(
             name=f"Custom Web {attack_type.upper()}",
             type="web",
-            content=content,
-            description=description,
+            content=content.format(target=target),
+            description=description.format(target=target),
             mitre_technique=mitre_technique,
             risk_level="LOW"
         )
@@ -221,27 +308,15 @@ class PayloadManager:
     def _generate_network_payload(self, **kwargs) -> Payload:
         """Generate network-based payload"""
         scan_type = kwargs.get('scan_type', 'port')
-        target = kwargs.get('target', 'localhost')
+        params = {'target': kwargs.get('target', 'localhost'), 'ports': kwargs.get('ports', '80,443,22')}
         
-        if scan_type == 'port':
-            ports = kwargs.get('ports', '80,443,22')
-            content = f"nmap -sS -p {ports} {target}"
-            description = f"Port scan of {target}"
-            mitre_technique = "T1046"
-        elif scan_type == 'dns':
-            content = f"nslookup {target}"
-            description = f"DNS query for {target}"
-            mitre_technique = "T1590"
-        else:
-            content = f"ping -c 1 {target}"
-            description = f"Ping test for {target}"
-            mitre_technique = "T1046"
+        content, description, mitre_technique = NETWORK_PAYLOAD_TEMPLATES.get(scan_type, DEFAULT_NETWORK_PAYLOAD_TEMPLATE)
         
         return Payload(
             name=f"Custom Network {scan_type.upper()}",
             type="network",
-            content=content,
-            description=description,
+            content=content.format_map(params),
+            description=description.format_map(params),
             mitre_technique=mitre_technique,
             risk_level="LOW"
         )
@@ -249,26 +324,15 @@ class PayloadManager:
     def _generate_filesystem_payload(self, **kwargs) -> Payload:
         """Generate filesystem-based payload"""
         operation = kwargs.get('operation', 'read')
-        path = kwargs.get('path', '/etc/passwd')
+        params = {'path': kwargs.get('path', '/etc/passwd')}
         
-        if operation == 'read':
-            content = f"cat {path}"
-            description = f"File read operation: {path}"
-            mitre_technique = "T1005"
-        elif operation == 'list':
-            content = f"ls -la {path}"
-            description = f"Directory listing: {path}"
-            mitre_technique = "T1083"
-        else:
-            content = f"stat {path}"
-            description = f"File stat operation: {path}"
-            mitre_technique = "T1005"
+        content, description, mitre_technique = FILESYSTEM_PAYLOAD_TEMPLATES.get(operation, DEFAULT_FILESYSTEM_PAYLOAD_TEMPLATE)
         
         return Payload(
             name=f"Custom Filesystem {operation.upper()}",
             type="filesystem",
-            content=content,
-            description=description,
+            content=content.format_map(params),
+            description=description.format_map(params),
             mitre_technique=mitre_technique,
             risk_level="LOW"
         )
@@ -276,74 +340,72 @@ class PayloadManager:
     def _generate_auth_payload(self, **kwargs) -> Payload:
         """Generate authentication-based payload"""
         auth_type = kwargs.get('auth_type', 'password')
-        username = kwargs.get('username', 'admin')
+        params = {'username': kwargs.get('username', 'admin'), 'password': kwargs.get('password', 'password123')}
+        if auth_type == 'token':
+            params['token'] = self._generate_random_token()
         
-        if auth_type == 'password':
-            password = kwargs.get('password', 'password123')
-            content = f"{username}:{password}"
-            description = f"Password test for {username}"
-            mitre_technique = "T1110"
-        elif auth_type == 'token':
-            content = f"Bearer {self._generate_random_token()}"
-            description = f"Token-based auth test"
-            mitre_technique = "T1078"
-        else:
-            content = f"{username}:"
-            description = f"Username test: {username}"
-            mitre_technique = "T1078"
+        content, description, mitre_technique = AUTH_PAYLOAD_TEMPLATES.get(auth_type, DEFAULT_AUTH_PAYLOAD_TEMPLATE)
         
         return Payload(
             name=f"Custom Auth {auth_type.upper()}",
             type="auth",
-            content=content,
-            description=description,
+            content=content.format_map(params),
+            description=description.format_map(params),
             mitre_technique=mitre_technique,
             risk_level="LOW"
         )
     
+    # Payload type -> generator, looked up by generate_custom_payload
+    _GENERATORS = {
+        'web': _generate_web_payload,
+        'network': _generate_network_payload,
+        'filesystem': _generate_filesystem_payload,
+        'auth': _generate_auth_payload
+    }
+    
     def _generate_random_token(self, length: int = 32) -> str:
         """Generate a random token for testing"""
-        chars = string.ascii_letters + string.digits
-        return ''.join(random.choice(chars) for _ in range(length))
+        # token_urlsafe yields about 1.3 characters per byte; trim to the requested length
+        return secrets.token_urlsafe(max(1, length))[:length]
     
     def save_payloads(self, filepath: str):
         """Save payloads to file"""
-        payloads_data = []
-        for payload in self.payloads.values():
-            payloads_data.append({
-                'name': payload.name,
-                'type': payload.type,
-                'content': payload.content,
-                'description': payload.description,
-                'mitre_technique': payload.mitre_technique,
-                'risk_level': payload.risk_level,
-                'sandbox_safe': payload.sandbox_safe,
-                'hash': payload.hash,
-                'created_at': payload.created_at
-            })
-        
-        with open(filepath, 'w') as f:
-            json.dump(payloads_data, f, indent=2)
+        payloads = list(self.payloads.values())
+        # Payload objects are turned into records by the encoder as it reaches them
+        if orjson is not None:
+            data = orjson.dumps(payloads, option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATACLASS, default=_payload_record)
+        else:
+            data = json.dumps(payloads, indent=2, default=_payload_record).encode('utf-8')
+        Path(filepath).write_bytes(data)
         
-        self.logger.info(f"Saved {len(payloads_data)} payloads to {filepath}")
+        self.logger.info(f"Saved {len(payloads)} payloads to {filepath}")
     
     def load_payloads(self, filepath: str):
         """Load payloads from file"""
-        with open(filepath, 'r') as f:
-            payloads_data = json.load(f)
-        
-        for payload_data in payloads_data:
-            payload = Payload(
-                name=payload_data['name'],
-                type=payload_data['type'],
-                content=payload_data['content'],
-                description=payload_data['description'],
-                mitre_technique=payload_data.get('mitre_technique'),
-                risk_level=payload_data.get('risk_level', 'LOW'),
-                sandbox_safe=payload_data.get('sandbox_safe', True),
-                hash=payload_data.get('hash'),
-                created_at=payload_data.get('created_at')
+        data = Path(filepath).read_bytes()
+        # Files are keyed by content, so an edited file is parsed again
+        key = hashlib.blake2b(data, digest_size=16).digest()
+        payloads = _LOADED_PAYLOADS.get(key)
+        if payloads is None:
+            payloads = tuple(
+                Payload(
+                    name=payload_data['name'],
+                    type=payload_data['type'],
+                    content=payload_data['content'],
+                    description=payload_data['description'],
+                    mitre_technique=payload_data.get('mitre_technique'),
+                    risk_level=payload_data.get('risk_level', 'LOW'),
+                    sandbox_safe=payload_data.get('sandbox_safe', True),
+                    hash=payload_data.get('hash'),
+                    created_at=payload_data.get('created_at')
+                )
+                for payload_data in (orjson.loads(data) if orjson is not None else json.loads(data))
             )
-            self.payloads[payload.name] = payload
+            if len(_LOADED_PAYLOADS) >= LOADED_PAYLOADS_CACHE_SIZE:
+                _LOADED_PAYLOADS.clear()
+            _LOADED_PAYLOADS[key] = payloads
+        
+        for payload in payloads:
+            self._store_payload(payload)
         
-        self.logger.info(f"Loaded {len(payloads_data)} payloads from {filepath}")
+        self.logger.info(f"Loaded {len(payloads)} payloads from {filepath}")
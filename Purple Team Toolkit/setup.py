@@ -3,18 +3,39 @@ Setup script for Purple Team Toolkit
 """
 
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
 from pathlib import Path
 
+# Directory holding this script; the README, requirements and package sources live beside it
+_HERE = Path(__file__).parent.resolve()
+
 # Read the README file
-readme_path = Path(__file__).parent / "README.md"
+readme_path = _HERE / "README.md"
 long_description = readme_path.read_text() if readme_path.exists() else ""
 
 # Read requirements
-requirements_path = Path(__file__).parent / "requirements.txt"
+requirements_path = _HERE / "requirements.txt"
 requirements = []
 if requirements_path.exists():
     with open(requirements_path, 'r') as f:
-        requirements = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        requirements = [line for line in map(str.strip, f) if line and not line.startswith('#')]
+
+class BuildPyWithCompiledTemplates(build_py):
+    """Compile the report templates to Python modules so installs skip Jinja parsing"""
+    
+    def run(self):
+        super().run()
+        try:
+            from jinja2 import Environment, FileSystemLoader
+        except ImportError:
+            return
+        
+        # Must match the autoescape setting of the runtime environment in purple_logic/correlation.py
+        logic_dir = _HERE / "purple_team_toolkit" / "purple_logic"
+        env = Environment(loader=FileSystemLoader(str(logic_dir / "templates")), autoescape=True)
+        target = Path(self.build_lib) / "purple_team_toolkit" / "purple_logic" / "templates_compiled"
+        target.mkdir(parents=True, exist_ok=True)
+        env.compile_templates(str(target), zip=None)
 
 setup(
     name="purple-team-toolkit",
@@ -46,12 +67,14 @@ setup(
             "purple-team-toolkit=purple_team_toolkit.cli:main",
         ],
     },
+    cmdclass={"build_py": BuildPyWithCompiledTemplates},
     include_package_data=True,
     package_data={
         "purple_team_toolkit": [
             "configs/*.json",
             "configs/scenarios/*.yaml",
             "configs/scenarios/*.yml",
+            "purple_logic/templates/*.html",
         ],
     },
     keywords="security, purple-team, red-team, blue-team, cybersecurity, detection, correlation",
@@ -0,0 +1,91 @@
+"""
+Unit tests for Purple Team correlation logic
+"""
+
+import unittest
+
+from purple_team_toolkit.config import Config
+from purple_team_toolkit.purple_logic import PurpleTeamEngine
+from purple_team_toolkit.red_team.modules import AttackResult
+
+ATTACK_TIME = 1_000_000.0
+
+def _attack(mitre_technique='T1046'):
+    """Attack record as produced by the Red Team activity runners"""
+    result = AttackResult(
+        technique='nmap_scan',
+        target='192.168.1.1',
+        success=True,
+        data={},
+        timestamp=ATTACK_TIME,
+        mitre_technique=mitre_technique
+    )
+    return {'module': 'recon', 'technique': 'nmap_scan', 'result': result, 'timestamp': ATTACK_TIME}
+
+def _detection(offset, event_type='port_scan', mitre_technique=None, description=''):
+    """Detection record as produced by Blue Team monitoring"""
+    return {
+        'event': {'event_type': event_type, 'mitre_technique': mitre_technique, 'description': description},
+        'timestamp': ATTACK_TIME + offset
+    }
+
+class TestCorrelationConfidence(unittest.TestCase):
+    """Test confidence scoring for attack-detection correlations"""
+    
+    def setUp(self):
+        self.engine = PurpleTeamEngine(Config())
+    
+    def _confidence(self, attack, detections, expected_detection='port_scan'):
+        index = self.engine._index_detections(detections)
+        return self.engine._calculate_correlation_confidence(attack, index, expected_detection)
+    
+    def test_close_detection_wins_over_earlier_distant_one(self):
+        """Any detection within 60 seconds earns the full bonus, whatever its position"""
+        detections = [_detection(120), _detection(-30)]
+        
+        self.assertAlmostEqual(self._confidence(_attack(), detections), 0.6)
+    
+    def test_distant_detection_only(self):
+        """Detections 61-300 seconds away earn the smaller bonus"""
+        detections = [_detection(120), _detection(-250)]
+        
+        self.assertAlmostEqual(self._confidence(_attack(), detections), 0.4)
+    
+    def test_detection_outside_window(self):
+        """Detections more than 5 minutes away add no temporal bonus"""
+        self.assertAlmostEqual(self._confidence(_attack(), [_detection(301)]), 0.3)
+    
+    def test_mitre_technique_bonus(self):
+        """A detection tagged with the attack's MITRE technique adds to the score"""
+        detections = [_detection(120), _detection(-30, mitre_technique='T1046')]
+        
+        self.assertAlmostEqual(self._confidence(_attack(), detections), 1.0)
+        self.assertAlmostEqual(self._confidence(_attack('T1190'), detections), 0.6)
+    
+    def test_unknown_rule_without_detections(self):
+        """No rule and no detections gives zero confidence"""
+        self.assertEqual(self._confidence(_attack(), [], expected_detection='unknown'), 0.0)
+
+class TestDetectionMatching(unittest.TestCase):
+    """Test lookup of the detection matching an attack"""
+    
+    def setUp(self):
+        self.engine = PurpleTeamEngine(Config())
+    
+    def test_matches_event_type_mitre_or_keywords(self):
+        """The earliest detection matching any criterion is returned"""
+        detections = [
+            _detection(0, event_type='login_failure'),
+            _detection(5, event_type='other', description='Possible NMAP SCAN from host'),
+            _detection(10, event_type='port_scan_detected'),
+            _detection(15, event_type='other', mitre_technique='T1078')
+        ]
+        index = self.engine._index_detections(detections, {'nmap scan'})
+        
+        self.assertEqual(self.engine._find_matching_detection(index, 'nmap_scan', 'port_scan'), 1)
+        self.assertEqual(self.engine._find_matching_detection(index, 'whois_lookup', 'port_scan'), 2)
+        self.assertEqual(self.engine._find_matching_detection(index, 'whois_lookup', 'T1078'), 3)
+        self.assertIsNone(self.engine._find_matching_detection(index, 'whois_lookup', 'dns_query'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,14 +3,15 @@ Unit tests for Red Team modules
 """
 
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 import time
 
 from purple_team_toolkit.red_team.modules import (
     ReconnaissanceModule, 
     ExploitationModule, 
     PostExploitationModule,
-    AttackResult
+    AttackResult,
+    _RECON_CACHE
 )
 from purple_team_toolkit.red_team.payloads import PayloadManager, Payload
 
@@ -20,35 +21,27 @@ class TestReconnaissanceModule(unittest.TestCase):
     def setUp(self):
         self.config = {'nmap_path': '/usr/bin/nmap'}
         self.recon_module = ReconnaissanceModule(self.config)
+        _RECON_CACHE.clear()
     
     @patch('purple_team_toolkit.red_team.modules.nmap.PortScanner')
     def test_nmap_scan_success(self, mock_nmap):
         """Test successful nmap scan"""
-        # Mock nmap results
-        mock_scanner = Mock()
+        # Mock nmap results; MagicMock supports item access, so the nmap dict lookups are plain dicts
+        mock_scanner = MagicMock()
         mock_scanner.all_hosts.return_value = ['192.168.1.1']
         
-        # Create a proper mock for the host object
-        mock_host = Mock()
+        mock_host = MagicMock()
         mock_host.state.return_value = 'up'
         mock_host.all_protocols.return_value = ['tcp']
         
-        # Create a proper mock for the tcp protocol
-        mock_tcp = Mock()
-        mock_tcp.keys.return_value = [80, 443]
-        
-        # Set up the mock to return the port data
+        # Port data for the tcp protocol, a plain dict as returned by python-nmap
         port_data = {
             80: {'state': 'open', 'name': 'http', 'version': '1.1', 'product': 'nginx'},
             443: {'state': 'open', 'name': 'https', 'version': '1.1', 'product': 'nginx'}
         }
-        mock_tcp.__getitem__ = Mock(side_effect=lambda key: port_data[key])
         
-        # Set up the host mock to return the tcp protocol
-        mock_host.__getitem__ = Mock(side_effect=lambda key: {'tcp': mock_tcp}[key])
-        
-        # Set up the scanner mock to return the host
-        mock_scanner.__getitem__ = Mock(side_effect=lambda key: {'192.168.1.1': mock_host}[key])
+        mock_host.__getitem__.side_effect = {'tcp': port_data}.__getitem__
+        mock_scanner.__getitem__.side_effect = {'192.168.1.1': mock_host}.__getitem__
         mock_scanner.scanstats.return_value = {'timestr': '0.05s'}
         mock_nmap.return_value = mock_scanner
         
@@ -63,6 +56,7 @@ class TestReconnaissanceModule(unittest.TestCase):
         self.assertEqual(result.technique, 'nmap_scan')
         self.assertEqual(result.target, '192.168.1.1')
         self.assertEqual(result.mitre_technique, 'T1046')
+        self.assertEqual(result.data['hosts']['192.168.1.1']['ports'][443]['service'], 'https')
     
     @patch('purple_team_toolkit.red_team.modules.nmap.PortScanner')
     def test_nmap_scan_failure(self, mock_nmap):
@@ -77,17 +71,26 @@ class TestReconnaissanceModule(unittest.TestCase):
         self.assertFalse(result.success)
         self.assertIn('error', result.data)
     
-    @patch('purple_team_toolkit.red_team.modules.dns.resolver.resolve')
-    def test_dns_enumeration_success(self, mock_resolve):
+    @patch('purple_team_toolkit.red_team.modules.shutil.which', return_value=None)
+    @patch('purple_team_toolkit.red_team.modules.dns.asyncresolver.resolve', new_callable=AsyncMock)
+    def test_dns_enumeration_success(self, mock_resolve, mock_which):
         """Test successful DNS enumeration"""
         # Mock DNS responses
-        mock_resolve.side_effect = [
-            ['192.168.1.1'],  # A record
-            ['2001:db8::1'],  # AAAA record
-            ['mail.example.com'],  # MX record
-            ['ns1.example.com', 'ns2.example.com'],  # NS record
-            ['v=spf1 include:_spf.example.com ~all']  # TXT record
-        ]
+        responses = {
+            ('example.com', 'A'): ['192.168.1.1'],
+            ('example.com', 'AAAA'): ['2001:db8::1'],
+            ('example.com', 'MX'): ['mail.example.com'],
+            ('example.com', 'NS'): ['ns1.example.com', 'ns2.example.com'],
+            ('example.com', 'TXT'): ['v=spf1 include:_spf.example.com ~all'],
+            ('www.example.com', 'A'): ['192.168.1.2']
+        }
+        
+        def resolve(name, record_type):
+            if (name, record_type) not in responses:
+                raise Exception("NXDOMAIN")
+            return responses[(name, record_type)]
+        
+        mock_resolve.side_effect = resolve
         
         result = self.recon_module.dns_enumeration('example.com')
         
@@ -96,6 +99,8 @@ class TestReconnaissanceModule(unittest.TestCase):
         self.assertEqual(result.technique, 'dns_enumeration')
         self.assertEqual(result.target, 'example.com')
         self.assertEqual(result.mitre_technique, 'T1590')
+        self.assertEqual(result.data['ns_records'], ['ns1.example.com', 'ns2.example.com'])
+        self.assertEqual(result.data['subdomains'], [{'subdomain': 'www', 'ip': '192.168.1.2'}])
     
     @patch('purple_team_toolkit.red_team.modules.whois')
     def test_whois_lookup_success(self, mock_whois):
@@ -127,13 +132,14 @@ class TestExploitationModule(unittest.TestCase):
         self.config = {}
         self.exploitation_module = ExploitationModule(self.config)
     
-    @patch('purple_team_toolkit.red_team.modules.requests.get')
-    def test_web_fuzzing_success(self, mock_get):
+    @patch('purple_team_toolkit.red_team.modules.requests.Session')
+    def test_web_fuzzing_success(self, mock_session):
         """Test successful web fuzzing"""
         # Mock HTTP responses
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.content = b'<html>Found</html>'
+        mock_get = mock_session.return_value.__enter__.return_value.get
         mock_get.return_value = mock_response
         
         result = self.exploitation_module.web_fuzzing('http://example.com')
@@ -143,14 +149,16 @@ class TestExploitationModule(unittest.TestCase):
         self.assertEqual(result.technique, 'web_fuzzing')
         self.assertEqual(result.target, 'http://example.com')
         self.assertEqual(result.mitre_technique, 'T1590')
+        self.assertEqual(mock_get.call_count, len(result.data['found_paths']))
     
-    @patch('purple_team_toolkit.red_team.modules.socket.socket')
-    def test_port_scan_success(self, mock_socket):
+    @patch.object(ExploitationModule, '_syn_scan', return_value=None)
+    @patch('purple_team_toolkit.red_team.modules.asyncio.open_connection', new_callable=AsyncMock)
+    def test_port_scan_success(self, mock_open_connection, mock_syn_scan):
         """Test successful port scan"""
-        # Mock socket connection
-        mock_sock = Mock()
-        mock_sock.connect_ex.return_value = 0  # Port open
-        mock_socket.return_value = mock_sock
+        # Mock connection: port 80 open, port 443 refused
+        mock_writer = MagicMock()
+        mock_writer.wait_closed = AsyncMock()
+        mock_open_connection.side_effect = [(Mock(), mock_writer), ConnectionRefusedError()]
         
         result = self.exploitation_module.port_scan('192.168.1.1', [80, 443])
         
@@ -159,6 +167,8 @@ class TestExploitationModule(unittest.TestCase):
         self.assertEqual(result.technique, 'port_scan')
         self.assertEqual(result.target, '192.168.1.1')
         self.assertEqual(result.mitre_technique, 'T1046')
+        self.assertEqual(result.data['open_ports'], [80])
+        self.assertEqual(result.data['closed_ports'], [443])
 
 class TestPostExploitationModule(unittest.TestCase):
     """Test post-exploitation module functionality"""
@@ -233,6 +243,17 @@ class TestPayloadManager(unittest.TestCase):
         self.assertEqual(payload.type, 'web')
         self.assertIn('script', payload.content)
     
+    @patch('purple_team_toolkit.red_team.payloads.time.time', side_effect=[100.0, 200.0])
+    def test_generate_custom_payload_repeated(self, mock_time):
+        """Test repeated identical requests get fresh payloads with the same content"""
+        first = self.payload_manager.generate_custom_payload('web', attack_type='xss', target='test')
+        second = self.payload_manager.generate_custom_payload('web', attack_type='xss', target='test')
+        
+        self.assertIsNot(first, second)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first.hash, second.hash)
+        self.assertEqual((first.created_at, second.created_at), (100.0, 200.0))
+    
     def test_list_payloads(self):
         """Test listing all payloads"""
         payloads = self.payload_manager.list_payloads()
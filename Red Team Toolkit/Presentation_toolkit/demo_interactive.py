@@ -4,6 +4,7 @@ Demo script for Interactive DNS Troubleshooting Toolkit
 This script demonstrates the interactive features without making network changes.
 """
 
+import functools
 import os
 import sys
 import platform
@@ -23,17 +24,32 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 
+# Evaluated once; the platform cannot change while the demo runs
+_IS_WINDOWS = platform.system() == "Windows"
+
+# Rule printed above and below every header
+_HEADER_BAR = '=' * 60
+
+
+@functools.lru_cache(maxsize=32)
+def _dash(width: int) -> str:
+    """Return a step underline of the given width."""
+    return '-' * width
+
+
 def print_header(title: str):
     """Print a formatted header."""
-    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*60}")
-    print(f"  {title}")
-    print(f"{'='*60}{Colors.ENDC}\n")
+    sys.stdout.write(f"\n{Colors.HEADER}{Colors.BOLD}{_HEADER_BAR}\n  {title}\n{_HEADER_BAR}{Colors.ENDC}\n\n")
+    sys.stdout.flush()
 
 
 def print_step(step_num: int, title: str):
     """Print a formatted step header."""
-    print(f"{Colors.OKBLUE}{Colors.BOLD}[Step {step_num}] {title}{Colors.ENDC}")
-    print(f"{Colors.OKBLUE}{'-' * (len(title) + 10)}{Colors.ENDC}")
+    sys.stdout.write(
+        f"{Colors.OKBLUE}{Colors.BOLD}[Step {step_num}] {title}{Colors.ENDC}\n"
+        f"{Colors.OKBLUE}{_dash(len(title) + 10)}{Colors.ENDC}\n"
+    )
+    sys.stdout.flush()
 
 
 def print_success(message: str):
@@ -71,7 +87,7 @@ def demo_interactive_features():
     print("  • dig (dnsutils package)")
     print("  • ping (iputils-ping package)")
     
-    if platform.system() == "Windows":
+    if _IS_WINDOWS:
         print("  • nslookup (Built-in Windows tool)")
         print("  • ping (Built-in Windows tool)")
         print("  • tshark (Wireshark CLI tools)")
@@ -128,7 +144,7 @@ def demo_interactive_features():
     
     # Show usage instructions
     print(f"\n{Colors.BOLD}To try the interactive toolkit:{Colors.ENDC}")
-    if platform.system() == "Windows":
+    if _IS_WINDOWS:
         print("  python dns_resolve_interactive_windows.py")
     else:
         print("  sudo python3 dns_resolve_interactive.py")
@@ -144,8 +160,7 @@ def show_feature_comparison():
         "Interactive": ["Automatic", "Yes", "User Choice", "Interactive", "Rich", "Advanced"]
     }
     
-    print(f"{Colors.BOLD}{'Feature':<20} {'Standard':<15} {'Interactive':<15}{Colors.ENDC}")
-    print("-" * 50)
+    rows = [f"{Colors.BOLD}{'Feature':<20} {'Standard':<15} {'Interactive':<15}{Colors.ENDC}", "-" * 50]
     
     for i in range(len(comparison["Feature"])):
         feature = comparison["Feature"][i]
@@ -158,7 +173,9 @@ def show_feature_comparison():
         elif interactive == "Advanced":
             interactive = f"{Colors.OKBLUE}{interactive}{Colors.ENDC}"
         
-        print(f"{feature:<20} {standard:<15} {interactive}")
+        rows.append(f"{feature:<20} {standard:<15} {interactive}")
+    
+    print('\n'.join(rows))
 
 
 def main():
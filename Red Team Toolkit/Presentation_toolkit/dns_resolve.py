@@ -4,13 +4,16 @@ DNS Troubleshooter Simulation Toolkit for Linux
 A presentation-ready tool for demonstrating DNS troubleshooting with Wireshark integration.
 """
 
+import json
+import asyncio
+import functools
 import os
+import shutil
 import sys
 import subprocess
 import time
-import signal
 import threading
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 
 
 class Colors:
@@ -26,68 +29,156 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 
+# Message templates, built once from the color codes
+_OK = f"{Colors.OKGREEN}✓ %s{Colors.ENDC}\n"
+_WARN = f"{Colors.WARNING}⚠ %s{Colors.ENDC}\n"
+_ERR = f"{Colors.FAIL}✗ %s{Colors.ENDC}\n"
+
+
+# tshark capture buffer in MiB; a larger buffer means fewer reads from the kernel
+CAPTURE_BUFFER_MB = 64
+# Bytes kept per packet; a classic 512-byte DNS message plus Ethernet/IPv6/UDP headers fits
+CAPTURE_SNAPLEN = 576
+
+# Seconds to wait for tshark to report that capture has started
+CAPTURE_START_TIMEOUT = 5
+# Seconds tshark gets to flush and exit after SIGTERM before it is killed
+CAPTURE_STOP_TIMEOUT = 2
+
+# dig attempts and per-attempt timeout in seconds for the DNS test steps
+DIG_TRIES = 1
+DIG_TIMEOUT = 2
+
+# Rule printed above and below every header
+_HEADER_BAR = '=' * 60
+
+
+@functools.lru_cache(maxsize=32)
+def _dash(width: int) -> str:
+    """Return a step underline of the given width."""
+    return '-' * width
+
+
 def print_header(title: str):
     """Print a formatted header."""
-    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*60}")
-    print(f"  {title}")
-    print(f"{'='*60}{Colors.ENDC}\n")
+    sys.stdout.write(f"\n{Colors.HEADER}{Colors.BOLD}{_HEADER_BAR}\n  {title}\n{_HEADER_BAR}{Colors.ENDC}\n\n")
+    sys.stdout.flush()
 
 
 def print_step(step_num: int, title: str):
     """Print a formatted step header."""
-    print(f"{Colors.OKBLUE}{Colors.BOLD}[Step {step_num}] {title}{Colors.ENDC}")
-    print(f"{Colors.OKBLUE}{'-' * (len(title) + 10)}{Colors.ENDC}")
+    sys.stdout.write(
+        f"{Colors.OKBLUE}{Colors.BOLD}[Step {step_num}] {title}{Colors.ENDC}\n"
+        f"{Colors.OKBLUE}{_dash(len(title) + 10)}{Colors.ENDC}\n"
+    )
+    sys.stdout.flush()
 
 
 def print_success(message: str):
     """Print a success message."""
-    print(f"{Colors.OKGREEN}✓ {message}{Colors.ENDC}")
+    sys.stdout.write(_OK % message)
 
 
 def print_warning(message: str):
     """Print a warning message."""
-    print(f"{Colors.WARNING}⚠ {message}{Colors.ENDC}")
+    sys.stdout.write(_WARN % message)
 
 
 def print_error(message: str):
     """Print an error message."""
-    print(f"{Colors.FAIL}✗ {message}{Colors.ENDC}")
+    sys.stdout.write(_ERR % message)
 
 
-def run_command(command: str, capture_output: bool = False) -> Optional[str]:
-    """Run a shell command and return output if requested."""
+def run_command(argv: List[str], capture_output: bool = False) -> Optional[str]:
+    """Run a command given as an argument list and return output if requested."""
     try:
         if capture_output:
-            result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=30)
+            result = subprocess.run(argv, capture_output=True, text=True, timeout=30)
             return result.stdout.strip()
         else:
-            subprocess.run(command, shell=True, check=True, timeout=30)
+            subprocess.run(argv, check=True, timeout=30)
             return None
     except subprocess.TimeoutExpired:
-        print_error(f"Command timed out: {command}")
+        print_error(f"Command timed out: {' '.join(argv)}")
         return None
     except subprocess.CalledProcessError as e:
-        print_error(f"Command failed: {command}")
+        print_error(f"Command failed: {' '.join(argv)}")
         return None
     except Exception as e:
         print_error(f"Error running command: {e}")
         return None
 
 
+async def _run_captured(argv: List[str], timeout: int = 30) -> Tuple[str, Optional[str]]:
+    """Run one command without a shell; return its combined output and any error message."""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+        )
+    except OSError as e:
+        return "", f"Error running command: {e}"
+    
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return "", f"Command timed out: {' '.join(argv)}"
+    
+    output = stdout.decode(errors='replace')
+    if process.returncode != 0:
+        return output, f"Command failed: {' '.join(argv)}"
+    return output, None
+
+
+async def _run_captured_all(commands: List[List[str]]) -> List[Tuple[str, Optional[str]]]:
+    """Run several commands concurrently, keeping their results in order."""
+    return await asyncio.gather(*(_run_captured(argv) for argv in commands))
+
+
+def run_commands(commands: List[List[str]]) -> List[Tuple[str, Optional[str]]]:
+    """Run independent commands concurrently; return (output, error) pairs in the given order."""
+    return asyncio.run(_run_captured_all(commands))
+
+
+def run_sections(sections: List[Tuple[str, List[str]]]):
+    """Run each section's command concurrently, then print every heading and its output in order."""
+    results = run_commands([argv for _, argv in sections])
+    
+    for (heading, _), (output, error) in zip(sections, results):
+        print(heading)
+        sys.stdout.write(output)
+        if error:
+            print_error(error)
+
+
+def run_dns_probes(domain: str):
+    """Ping and look up a domain at the same time, printing both results in order."""
+    run_sections([
+        (f"Testing ping to {domain}...", ["ping", "-c", "3", domain]),
+        # One try with a short timeout, so a dead DNS server fails in seconds rather than 15
+        ("\nTesting DNS lookup with dig...", ["dig", f"+tries={DIG_TRIES}", f"+time={DIG_TIMEOUT}", domain])
+    ])
+
+
 def get_network_interface() -> Optional[str]:
     """Get the active network interface."""
     try:
         # Get default route interface
-        result = subprocess.run("ip route | grep default | awk '{print $5}'", 
-                              shell=True, capture_output=True, text=True, timeout=10)
+        result = subprocess.run(["ip", "-json", "route", "show", "default"],
+                              capture_output=True, text=True, timeout=10)
         if result.returncode == 0 and result.stdout.strip():
-            return result.stdout.strip()
+            for route in json.loads(result.stdout):
+                if route.get('dev'):
+                    return route['dev']
         
         # Fallback: get first non-loopback interface
-        result = subprocess.run("ip link show | grep -E '^[0-9]+:' | grep -v lo | head -1 | awk -F': ' '{print $2}'", 
-                              shell=True, capture_output=True, text=True, timeout=10)
+        result = subprocess.run(["ip", "-json", "link", "show"],
+                              capture_output=True, text=True, timeout=10)
         if result.returncode == 0 and result.stdout.strip():
-            return result.stdout.strip()
+            for link in json.loads(result.stdout):
+                if link.get('ifname') and link['ifname'] != 'lo':
+                    return link['ifname']
         
         return None
     except Exception as e:
@@ -98,11 +189,7 @@ def get_network_interface() -> Optional[str]:
 def check_dependencies() -> bool:
     """Check if required dependencies are installed."""
     dependencies = ['tshark', 'resolvectl', 'dig', 'ping']
-    missing = []
-    
-    for dep in dependencies:
-        if subprocess.run(f"which {dep}", shell=True, capture_output=True).returncode != 0:
-            missing.append(dep)
+    missing = [dep for dep in dependencies if shutil.which(dep) is None]
     
     if missing:
         print_error(f"Missing dependencies: {', '.join(missing)}")
@@ -118,20 +205,33 @@ def display_network_info(interface: str):
     
     print(f"{Colors.OKCYAN}Network Interface: {interface}{Colors.ENDC}")
     
-    # Show interface details
-    print(f"\n{Colors.BOLD}Interface Details:{Colors.ENDC}")
-    run_command(f"ip addr show {interface}")
+    # The three probes are independent, so run them together and print in order
+    run_sections([
+        (f"\n{Colors.BOLD}Interface Details:{Colors.ENDC}", ["ip", "addr", "show", interface]),
+        (f"\n{Colors.BOLD}DNS Configuration:{Colors.ENDC}", ["cat", "/etc/resolv.conf"]),
+        (f"\n{Colors.BOLD}Current DNS Servers:{Colors.ENDC}", ["resolvectl", "status"])
+    ])
+
+
+def _wait_for_capture(process: subprocess.Popen, timeout: float = CAPTURE_START_TIMEOUT) -> bool:
+    """Wait until tshark reports it is capturing, then tell whether it is still running."""
+    ready = threading.Event()
     
-    # Show DNS configuration
-    print(f"\n{Colors.BOLD}DNS Configuration:{Colors.ENDC}")
-    run_command("cat /etc/resolv.conf")
+    def drain_stderr():
+        # Keep reading after the readiness line so tshark never blocks on a full pipe
+        for line in process.stderr:
+            if 'Capturing on' in line:
+                ready.set()
+        # stderr closed: tshark is exiting, so reap it before reporting
+        process.wait()
+        ready.set()
     
-    # Show current DNS servers
-    print(f"\n{Colors.BOLD}Current DNS Servers:{Colors.ENDC}")
-    run_command("resolvectl status")
+    threading.Thread(target=drain_stderr, daemon=True).start()
+    ready.wait(timeout)
+    return process.poll() is None
 
 
-def start_wireshark_capture(interface: str, capture_file: str) -> Optional[int]:
+def start_wireshark_capture(interface: str, capture_file: str) -> Optional[subprocess.Popen]:
     """Start Wireshark capture in background."""
     print_step(2, "Starting Wireshark Capture")
     
@@ -141,16 +241,14 @@ def start_wireshark_capture(interface: str, capture_file: str) -> Optional[int]:
     try:
         # Start tshark in background
         process = subprocess.Popen(
-            f"sudo tshark -i {interface} -w {capture_file} -f 'port 53'",
-            shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            ["sudo", "tshark", "-i", interface, "-w", capture_file,
+             "-B", str(CAPTURE_BUFFER_MB), "-s", str(CAPTURE_SNAPLEN), "-n", "-f", "port 53"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, bufsize=1
         )
         
-        # Wait a moment for capture to start
-        time.sleep(2)
-        
-        if process.poll() is None:  # Process is still running
+        if _wait_for_capture(process):  # Process is still running
             print_success("Wireshark capture started successfully")
-            return process.pid
+            return process
         else:
             print_error("Failed to start Wireshark capture")
             return None
@@ -165,11 +263,11 @@ def simulate_dns_failure(interface: str):
     print_step(3, "Simulating DNS Failure")
     
     print("Setting DNS to non-existent server: 123.123.123.123")
-    run_command(f"sudo resolvectl dns {interface} 123.123.123.123")
+    run_command(["sudo", "resolvectl", "dns", interface, "123.123.123.123"])
     
     # Flush DNS cache
     print("Flushing DNS cache...")
-    run_command("sudo resolvectl flush-caches")
+    run_command(["sudo", "resolvectl", "flush-caches"])
     
     time.sleep(2)
     print_success("DNS failure simulated")
@@ -179,11 +277,7 @@ def test_dns_failure():
     """Test DNS resolution (should fail)."""
     print_step(4, "Testing DNS Resolution (Expected to Fail)")
     
-    print("Testing ping to google.com...")
-    run_command("ping -c 3 google.com")
-    
-    print("\nTesting DNS lookup with dig...")
-    run_command("dig google.com")
+    run_dns_probes("google.com")
     
     print_warning("DNS resolution should be failing now")
 
@@ -193,10 +287,10 @@ def restore_dns(interface: str):
     print_step(5, "Restoring DNS Configuration")
     
     print("Setting DNS back to Google DNS: 8.8.8.8")
-    run_command(f"sudo resolvectl dns {interface} 8.8.8.8")
+    run_command(["sudo", "resolvectl", "dns", interface, "8.8.8.8"])
     
     print("Flushing DNS cache...")
-    run_command("sudo resolvectl flush-caches")
+    run_command(["sudo", "resolvectl", "flush-caches"])
     
     time.sleep(2)
     print_success("DNS configuration restored")
@@ -206,30 +300,25 @@ def test_dns_recovery():
     """Test DNS resolution (should work)."""
     print_step(6, "Testing DNS Resolution (Should Work Now)")
     
-    print("Testing ping to google.com...")
-    run_command("ping -c 3 google.com")
-    
-    print("\nTesting DNS lookup with dig...")
-    run_command("dig google.com")
+    run_dns_probes("google.com")
     
     print_success("DNS resolution should be working now")
 
 
-def stop_wireshark_capture(pid: int, capture_file: str):
+def stop_wireshark_capture(process: subprocess.Popen, capture_file: str):
     """Stop Wireshark capture."""
     print_step(7, "Stopping Wireshark Capture")
     
     try:
-        os.kill(pid, signal.SIGTERM)
-        time.sleep(1)
+        process.terminate()
         
-        # Check if process is still running
+        # wait() returns as soon as tshark exits, so the grace period only costs time when it hangs
         try:
-            os.kill(pid, 0)
+            process.wait(timeout=CAPTURE_STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
             print_warning("Process still running, force killing...")
-            os.kill(pid, signal.SIGKILL)
-        except OSError:
-            pass
+            process.kill()
+            process.wait()
         
         print_success("Wireshark capture stopped")
         print(f"Capture saved as: {capture_file}")
@@ -282,15 +371,15 @@ def main():
     
     # Configuration
     capture_file = "dns_capture.pcap"
-    wireshark_pid = None
+    wireshark_proc = None
     
     try:
         # Step 1: Display network info
         display_network_info(interface)
         
         # Step 2: Start Wireshark capture
-        wireshark_pid = start_wireshark_capture(interface, capture_file)
-        if not wireshark_pid:
+        wireshark_proc = start_wireshark_capture(interface, capture_file)
+        if wireshark_proc is None:
             print_error("Failed to start capture, continuing without it...")
         
         # Step 3: Simulate DNS failure
@@ -306,8 +395,8 @@ def main():
         test_dns_recovery()
         
         # Step 7: Stop capture
-        if wireshark_pid:
-            stop_wireshark_capture(wireshark_pid, capture_file)
+        if wireshark_proc is not None:
+            stop_wireshark_capture(wireshark_proc, capture_file)
         
         # Step 8: Analysis tips
         display_analysis_tips()
@@ -318,13 +407,13 @@ def main():
         
     except KeyboardInterrupt:
         print_warning("\nSimulation interrupted by user")
-        if wireshark_pid:
+        if wireshark_proc is not None:
             print("Stopping Wireshark capture...")
-            stop_wireshark_capture(wireshark_pid, capture_file)
+            stop_wireshark_capture(wireshark_proc, capture_file)
     except Exception as e:
         print_error(f"Unexpected error: {e}")
-        if wireshark_pid:
-            stop_wireshark_capture(wireshark_pid, capture_file)
+        if wireshark_proc is not None:
+            stop_wireshark_capture(wireshark_proc, capture_file)
 
 
 if __name__ == "__main__":
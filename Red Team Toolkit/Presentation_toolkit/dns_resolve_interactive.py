@@ -4,15 +4,21 @@ Interactive DNS Troubleshooter Simulation Toolkit
 A fully interactive, CLI-based tool for demonstrating DNS troubleshooting with automatic setup.
 """
 
+import asyncio
+import atexit
+import functools
+import json
 import os
 import sys
 import subprocess
 import time
-import signal
 import threading
 import platform
+import queue
+import shlex
 import shutil
-from typing import Optional, List, Dict
+import tempfile
+from typing import Optional, List, Dict, Tuple, Union
 
 
 class Colors:
@@ -28,37 +34,71 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 
+# Message templates, built once from the color codes
+_HEADER = f"\n{Colors.HEADER}{Colors.BOLD}{'=' * 60}\n  %s\n{'=' * 60}{Colors.ENDC}\n\n"
+_STEP = f"{Colors.OKBLUE}{Colors.BOLD}[Step %d] %s{Colors.ENDC}\n{Colors.OKBLUE}%s{Colors.ENDC}\n"
+_OK = f"{Colors.OKGREEN}✓ %s{Colors.ENDC}\n"
+_WARN = f"{Colors.WARNING}⚠ %s{Colors.ENDC}\n"
+_ERR = f"{Colors.FAIL}✗ %s{Colors.ENDC}\n"
+_INFO = f"{Colors.OKCYAN}ℹ %s{Colors.ENDC}\n"
+
+
+# Per-interface state on Linux, and the loopback bit of its flags file
+SYS_CLASS_NET = '/sys/class/net'
+IFF_LOOPBACK = 0x8
+
+# tshark capture buffer in MiB; a larger buffer means fewer reads from the kernel
+CAPTURE_BUFFER_MB = 64
+# Bytes kept per packet; a classic 512-byte DNS message plus Ethernet/IPv6/UDP headers fits
+CAPTURE_SNAPLEN = 576
+
+# Seconds a package manager may run while installing dependencies
+INSTALL_TIMEOUT = 600
+
+# RAM-backed directory the capture is written to before being moved into place
+CAPTURE_STAGING_DIR = '/dev/shm'
+
+# One DNS lookup attempt with a short timeout, so a dead resolver fails in seconds rather than 15
+DNS_PROBE_TRIES = 1
+DNS_PROBE_TIMEOUT = 2
+
+# Seconds a single PowerShell command may run before the session is killed
+POWERSHELL_TIMEOUT = 30
+
+# Seconds to wait for tshark to report that capture has started
+CAPTURE_START_TIMEOUT = 5
+# Seconds tshark gets to flush and exit after SIGTERM before it is killed
+CAPTURE_STOP_TIMEOUT = 2
+
+
 def print_header(title: str):
     """Print a formatted header."""
-    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*60}")
-    print(f"  {title}")
-    print(f"{'='*60}{Colors.ENDC}\n")
+    sys.stdout.write(_HEADER % title)
 
 
 def print_step(step_num: int, title: str):
     """Print a formatted step header."""
-    print(f"{Colors.OKBLUE}{Colors.BOLD}[Step {step_num}] {title}{Colors.ENDC}")
-    print(f"{Colors.OKBLUE}{'-' * (len(title) + 10)}{Colors.ENDC}")
+    sys.stdout.write(_STEP % (step_num, title, '-' * (len(title) + 10)))
 
 
 def print_success(message: str):
     """Print a success message."""
-    print(f"{Colors.OKGREEN}✓ {message}{Colors.ENDC}")
+    sys.stdout.write(_OK % message)
 
 
 def print_warning(message: str):
     """Print a warning message."""
-    print(f"{Colors.WARNING}⚠ {message}{Colors.ENDC}")
+    sys.stdout.write(_WARN % message)
 
 
 def print_error(message: str):
     """Print an error message."""
-    print(f"{Colors.FAIL}✗ {message}{Colors.ENDC}")
+    sys.stdout.write(_ERR % message)
 
 
 def print_info(message: str):
     """Print an info message."""
-    print(f"{Colors.OKCYAN}ℹ {message}{Colors.ENDC}")
+    sys.stdout.write(_INFO % message)
 
 
 def get_user_input(prompt: str, default: str = "", required: bool = True) -> str:
@@ -113,14 +153,18 @@ def confirm_action(prompt: str, default: bool = True) -> bool:
         print_error("Please enter 'y' or 'n'")
 
 
-def run_command(command: str, capture_output: bool = False, timeout: int = 30) -> Optional[str]:
-    """Run a shell command and return output if requested."""
+def run_command(command: Union[str, List[str]], capture_output: bool = False, timeout: int = 30) -> Optional[str]:
+    """Run a command without a shell and return output if requested."""
+    # Strings are split like a shell would, but no shell process is started
+    argv = shlex.split(command) if isinstance(command, str) else command
+    if not isinstance(command, str):
+        command = ' '.join(command)
     try:
         if capture_output:
-            result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=timeout)
+            result = subprocess.run(argv, capture_output=True, text=True, timeout=timeout)
             return result.stdout.strip() if result.returncode == 0 else None
         else:
-            subprocess.run(command, shell=True, check=True, timeout=timeout)
+            subprocess.run(argv, check=True, timeout=timeout)
             return None
     except subprocess.TimeoutExpired:
         print_error(f"Command timed out: {command}")
@@ -133,27 +177,201 @@ def run_command(command: str, capture_output: bool = False, timeout: int = 30) -
         return None
 
 
+async def _run_exec(argv: List[str], timeout: int = 30) -> Tuple[str, Optional[str]]:
+    """Run one command without a shell; return its combined output and any error message."""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+        )
+    except OSError as e:
+        return "", f"Error running command: {e}"
+    
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return "", f"Command timed out: {' '.join(argv)}"
+    
+    output = stdout.decode(errors='replace')
+    if process.returncode != 0:
+        return output, f"Command failed: {' '.join(argv)}"
+    return output, None
+
+
+def _read_resolv_conf() -> Tuple[str, Optional[str]]:
+    """Read /etc/resolv.conf directly rather than starting cat."""
+    try:
+        with open("/etc/resolv.conf") as f:
+            return f.read(), None
+    except OSError as e:
+        return "", f"Could not read /etc/resolv.conf: {e}"
+
+
+async def _gather_info_linux(interface: str) -> List[Tuple[str, Optional[str]]]:
+    """Collect interface details, resolv.conf and resolver status at the same time, in that order."""
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(
+        _run_exec(["ip", "addr", "show", interface]),
+        loop.run_in_executor(None, _read_resolv_conf),
+        _run_exec(["resolvectl", "status"])
+    )
+
+
+def _print_sections(headings: Tuple[str, ...], results: List[Tuple[str, Optional[str]]]):
+    """Print each heading followed by its probe output and any error."""
+    for heading, (output, error) in zip(headings, results):
+        print(heading)
+        sys.stdout.write(output)
+        if error:
+            print_error(error)
+
+
+async def _gather_dns_probes(target_domain: str) -> List[Tuple[str, Optional[str]]]:
+    """Ping and look up a domain at the same time, returning both results in that order."""
+    if platform.system() == "Windows":
+        ping = ["ping", "-n", "3", target_domain]
+        lookup = ["nslookup", f"-timeout={DNS_PROBE_TIMEOUT}", f"-retry={DNS_PROBE_TRIES}", target_domain]
+    else:
+        ping = ["ping", "-c", "3", target_domain]
+        lookup = ["dig", f"+tries={DNS_PROBE_TRIES}", f"+time={DNS_PROBE_TIMEOUT}", target_domain]
+    return await asyncio.gather(_run_exec(ping), _run_exec(lookup))
+
+
+def run_dns_probes(target_domain: str):
+    """Run the ping and DNS lookup probes concurrently and print them in order."""
+    lookup_tool = "nslookup" if platform.system() == "Windows" else "dig"
+    _print_sections(
+        (f"Testing ping to {target_domain}...", f"\nTesting DNS lookup with {lookup_tool}..."),
+        asyncio.run(_gather_dns_probes(target_domain))
+    )
+
+
+class PowerShellSession:
+    """A single long-lived PowerShell process that runs commands sent over stdin."""
+    
+    # Printed after each command so its output can be told apart from the next one
+    SENTINEL = '__DNS_TOOLKIT_DONE__'
+    
+    def __init__(self):
+        self.process = subprocess.Popen(
+            ["powershell.exe", "-NoProfile", "-NoLogo", "-NonInteractive", "-Command", "-"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, bufsize=1
+        )
+        # A reader thread feeds stdout through a queue so run() can give up after a deadline
+        self.lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        threading.Thread(target=self._pump_stdout, daemon=True).start()
+    
+    def _pump_stdout(self):
+        """Forward PowerShell output line by line; None marks end of output."""
+        for line in self.process.stdout:
+            self.lines.put(line)
+        self.lines.put(None)
+    
+    def run(self, command: str, timeout: float = POWERSHELL_TIMEOUT) -> str:
+        """Run one command and return everything it printed, killing the session if it stalls."""
+        self.process.stdin.write(f"{command}\nWrite-Output '{self.SENTINEL}'\n")
+        self.process.stdin.flush()
+        
+        deadline = time.monotonic() + timeout
+        lines = []
+        while True:
+            try:
+                line = self.lines.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                self.process.kill()
+                raise TimeoutError(f"PowerShell command timed out: {command}")
+            if line is None:
+                raise RuntimeError("PowerShell session exited unexpectedly")
+            if line.strip() == self.SENTINEL:
+                return ''.join(lines)
+            lines.append(line)
+    
+    def close(self):
+        """Ask PowerShell to exit, killing it if it does not."""
+        if self.process.poll() is not None:
+            return
+        try:
+            self.process.stdin.write("exit\n")
+            self.process.stdin.flush()
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+
+
+@functools.lru_cache(maxsize=None)
+def _powershell_session() -> PowerShellSession:
+    """Start the shared PowerShell session on first use; it is closed at exit."""
+    session = PowerShellSession()
+    atexit.register(session.close)
+    return session
+
+
+def _run_in_session(command: str) -> str:
+    """Run a command in the shared session, discarding the session if it fails."""
+    session = _powershell_session()
+    try:
+        return session.run(command)
+    except (OSError, RuntimeError):
+        # A stalled or dead session is no use to later commands; start a fresh one next time
+        session.close()
+        _powershell_session.cache_clear()
+        raise
+
+
+def run_powershell(command: str) -> Optional[str]:
+    """Run a PowerShell command in the shared session and print its output."""
+    try:
+        output = _run_in_session(command)
+    except (OSError, RuntimeError) as e:
+        print_error(f"Error running PowerShell command: {e}")
+        return None
+    sys.stdout.write(output)
+    return output
+
+
+@functools.lru_cache(maxsize=None)
+def _which_cached(name: str) -> Optional[str]:
+    """Locate a program on PATH once per process."""
+    return shutil.which(name)
+
+
+def run_install(commands: List[List[str]], timeout: int = INSTALL_TIMEOUT) -> bool:
+    """Run package manager commands in order, stopping at the first failure."""
+    for argv in commands:
+        try:
+            subprocess.run(argv, check=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            print_error(f"Command timed out: {' '.join(argv)}")
+            return False
+        except (subprocess.CalledProcessError, OSError):
+            print_error(f"Command failed: {' '.join(argv)}")
+            return False
+    return True
+
+
 def install_wireshark_linux():
     """Install Wireshark on Linux systems."""
     print_info("Installing Wireshark CLI tools...")
     
     # Detect package manager
-    if shutil.which("apt-get"):
+    if _which_cached("apt-get"):
         package_manager = "apt"
-        install_cmd = "sudo apt-get update && sudo apt-get install -y wireshark-cli"
-    elif shutil.which("yum"):
+        install_cmds = [["sudo", "apt-get", "update"], ["sudo", "apt-get", "install", "-y", "wireshark-cli"]]
+    elif _which_cached("yum"):
         package_manager = "yum"
-        install_cmd = "sudo yum install -y wireshark-cli"
-    elif shutil.which("dnf"):
+        install_cmds = [["sudo", "yum", "install", "-y", "wireshark-cli"]]
+    elif _which_cached("dnf"):
         package_manager = "dnf"
-        install_cmd = "sudo dnf install -y wireshark-cli"
+        install_cmds = [["sudo", "dnf", "install", "-y", "wireshark-cli"]]
     else:
         print_error("Could not detect package manager (apt, yum, or dnf)")
         return False
     
     print_info(f"Using {package_manager} package manager")
     
-    if run_command(install_cmd):
+    if run_install(install_cmds):
         print_success("Wireshark CLI tools installed successfully")
         return True
     else:
@@ -196,7 +414,7 @@ def check_and_install_dependencies_linux():
     missing = []
     
     for dep, description in dependencies.items():
-        if not shutil.which(dep):
+        if not _which_cached(dep):
             missing.append((dep, description))
         else:
             print_success(f"{dep} found ({description})")
@@ -212,17 +430,17 @@ def check_and_install_dependencies_linux():
                 else:
                     print_info(f"Installing {dep}...")
                     if platform.system() == "Linux":
-                        if shutil.which("apt-get"):
-                            install_cmd = f"sudo apt-get install -y {dep}"
-                        elif shutil.which("yum"):
-                            install_cmd = f"sudo yum install -y {dep}"
-                        elif shutil.which("dnf"):
-                            install_cmd = f"sudo dnf install -y {dep}"
+                        if _which_cached("apt-get"):
+                            install_cmd = ["sudo", "apt-get", "install", "-y", dep]
+                        elif _which_cached("yum"):
+                            install_cmd = ["sudo", "yum", "install", "-y", dep]
+                        elif _which_cached("dnf"):
+                            install_cmd = ["sudo", "dnf", "install", "-y", dep]
                         else:
                             print_error(f"Could not install {dep} automatically")
                             return False
                         
-                        if not run_command(install_cmd):
+                        if not run_install([install_cmd]):
                             print_error(f"Failed to install {dep}")
                             return False
                         else:
@@ -244,7 +462,7 @@ def check_and_install_dependencies_windows():
     missing = []
     
     for dep, description in dependencies.items():
-        if not shutil.which(dep):
+        if not _which_cached(dep):
             missing.append((dep, description))
         else:
             print_success(f"{dep} found ({description})")
@@ -289,49 +507,100 @@ def get_network_interface() -> Optional[str]:
         return get_network_interface_linux()
 
 
+@functools.lru_cache(maxsize=None)
+def _list_interfaces_cached(platform_tag: str) -> Tuple[str, ...]:
+    """List the interfaces offered for capture, probing the system once per process."""
+    if platform_tag == "Windows":
+        return _list_interfaces_windows()
+    return _list_interfaces_linux()
+
+
+def _list_interfaces_linux() -> Tuple[str, ...]:
+    """Return active non-loopback interfaces, or every interface if none are up."""
+    if not os.path.isdir(SYS_CLASS_NET):
+        return _list_interfaces_ip()
+    
+    # sysfs exposes link state and flags directly, so no process is needed
+    interfaces = sorted(os.listdir(SYS_CLASS_NET))
+    active_interfaces = []
+    for iface in interfaces:
+        try:
+            with open(os.path.join(SYS_CLASS_NET, iface, 'operstate')) as f:
+                operstate = f.read().strip()
+            with open(os.path.join(SYS_CLASS_NET, iface, 'flags')) as f:
+                flags = int(f.read(), 16)
+        except (OSError, ValueError):
+            continue
+        if operstate == 'up' and not flags & IFF_LOOPBACK:
+            active_interfaces.append(iface)
+    
+    return tuple(active_interfaces or interfaces)
+
+
+def _list_interfaces_ip() -> Tuple[str, ...]:
+    """Fallback for systems without sysfs: parse a single 'ip -o link show'."""
+    result = subprocess.run(["ip", "-o", "link", "show"], capture_output=True, text=True, timeout=10)
+    if result.returncode != 0:
+        return ()
+    
+    interfaces = []
+    active_interfaces = []
+    for line in result.stdout.splitlines():
+        fields = line.split(': ', 2)
+        if len(fields) < 3:
+            continue
+        # Virtual links are listed as name@peer
+        iface = fields[1].split('@', 1)[0]
+        interfaces.append(iface)
+        if iface != 'lo' and ' state UP ' in fields[2]:
+            active_interfaces.append(iface)
+    
+    return tuple(active_interfaces or interfaces)
+
+
+def _list_interfaces_windows() -> Tuple[str, ...]:
+    """Return adapters that are up, or every adapter if none are."""
+    output = _run_in_session("Get-NetAdapter | Select-Object Name, Status | ConvertTo-Json -Compress")
+    if not output.strip():
+        return ()
+    
+    adapters = json.loads(output)
+    if isinstance(adapters, dict):
+        # ConvertTo-Json emits a bare object for a single adapter
+        adapters = [adapters]
+    
+    interfaces = [adapter['Name'] for adapter in adapters if adapter.get('Name')]
+    active_interfaces = [adapter['Name'] for adapter in adapters if adapter.get('Name') and adapter.get('Status') == 'Up']
+    return tuple(active_interfaces or interfaces)
+
+
+def _select_interface(interfaces: Tuple[str, ...]) -> Optional[str]:
+    """Use the only interface or let the user choose between several."""
+    if not interfaces:
+        print_error("No network interfaces found")
+        return None
+    
+    if len(interfaces) == 1:
+        interface = interfaces[0]
+        print_success(f"Using interface: {interface}")
+        return interface
+    
+    # Let user choose
+    print_info("Multiple network interfaces detected:")
+    for i, iface in enumerate(interfaces):
+        print(f"  {i+1}. {iface}")
+    
+    choice = get_user_choice("Select network interface:", list(interfaces), 0)
+    selected_interface = interfaces[choice]
+    
+    print_success(f"Selected interface: {selected_interface}")
+    return selected_interface
+
+
 def get_network_interface_linux() -> Optional[str]:
     """Get network interface on Linux with user selection."""
     try:
-        # Get all network interfaces
-        result = run_command("ip link show | grep -E '^[0-9]+:' | awk -F': ' '{print $2}'", True)
-        if not result:
-            print_error("Could not detect network interfaces")
-            return None
-        
-        interfaces = [iface.strip() for iface in result.split('\n') if iface.strip()]
-        
-        if not interfaces:
-            print_error("No network interfaces found")
-            return None
-        
-        # Filter out loopback and down interfaces
-        active_interfaces = []
-        for iface in interfaces:
-            if iface != 'lo':  # Skip loopback
-                # Check if interface is up
-                status_result = run_command(f"ip link show {iface} | grep -q 'state UP'", True)
-                if status_result is not None:
-                    active_interfaces.append(iface)
-        
-        if not active_interfaces:
-            active_interfaces = interfaces  # Fallback to all interfaces
-        
-        if len(active_interfaces) == 1:
-            interface = active_interfaces[0]
-            print_success(f"Using interface: {interface}")
-            return interface
-        
-        # Let user choose
-        print_info("Multiple network interfaces detected:")
-        for i, iface in enumerate(active_interfaces):
-            print(f"  {i+1}. {iface}")
-        
-        choice = get_user_choice("Select network interface:", active_interfaces, 0)
-        selected_interface = active_interfaces[choice]
-        
-        print_success(f"Selected interface: {selected_interface}")
-        return selected_interface
-        
+        return _select_interface(_list_interfaces_cached("Linux"))
     except Exception as e:
         print_error(f"Error getting network interface: {e}")
         return None
@@ -340,62 +609,38 @@ def get_network_interface_linux() -> Optional[str]:
 def get_network_interface_windows() -> Optional[str]:
     """Get network interface on Windows with user selection."""
     try:
-        # Get network adapters using PowerShell
-        result = run_command(
-            "powershell.exe -Command \"Get-NetAdapter | Where-Object {$_.Status -eq 'Up'} | Select-Object Name, InterfaceDescription | ConvertTo-Json\"",
-            True
-        )
-        
-        if not result:
-            print_error("Could not detect network interfaces")
-            return None
-        
-        # Parse JSON output (simplified)
-        interfaces = []
-        lines = result.split('\n')
-        current_name = None
-        
-        for line in lines:
-            if '"Name"' in line:
-                current_name = line.split('"Name":')[1].strip().strip('",')
-            elif '"InterfaceDescription"' in line and current_name:
-                interfaces.append(current_name)
-                current_name = None
-        
-        if not interfaces:
-            # Fallback: get all interfaces
-            result = run_command(
-                "powershell.exe -Command \"Get-NetAdapter | Select-Object -ExpandProperty Name\"",
-                True
-            )
-            if result:
-                interfaces = [iface.strip() for iface in result.split('\n') if iface.strip()]
-        
-        if not interfaces:
-            print_error("No network interfaces found")
-            return None
-        
-        if len(interfaces) == 1:
-            interface = interfaces[0]
-            print_success(f"Using interface: {interface}")
-            return interface
-        
-        # Let user choose
-        print_info("Multiple network interfaces detected:")
-        for i, iface in enumerate(interfaces):
-            print(f"  {i+1}. {iface}")
-        
-        choice = get_user_choice("Select network interface:", interfaces, 0)
-        selected_interface = interfaces[choice]
-        
-        print_success(f"Selected interface: {selected_interface}")
-        return selected_interface
-        
+        return _select_interface(_list_interfaces_cached("Windows"))
     except Exception as e:
         print_error(f"Error getting network interface: {e}")
         return None
 
 
+def capture_staging_path(capture_file: str) -> str:
+    """Pick where tshark writes while capturing; RAM-backed /dev/shm when available."""
+    if os.path.isdir(CAPTURE_STAGING_DIR):
+        # The capture is short-lived, so keep its writes in memory and copy it out once at the end.
+        # /dev/shm is world-writable and this runs as root, so the name must be unpredictable.
+        fd, staging_file = tempfile.mkstemp(prefix='dns_capture_', suffix='.pcap', dir=CAPTURE_STAGING_DIR)
+        os.close(fd)
+        # Covers runs that end before the capture is stopped, such as a cancelled simulation
+        atexit.register(discard_staging_file, staging_file, capture_file)
+        return staging_file
+    # Without tmpfs a staging copy would hit the same disk, so write to the final file directly
+    return capture_file
+
+
+def discard_staging_file(staging_file: Optional[str], capture_file: str):
+    """Remove a leftover staging capture so it does not keep holding RAM."""
+    if not staging_file or staging_file == capture_file:
+        return
+    try:
+        os.remove(staging_file)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print_warning(f"Could not remove staging capture {staging_file}: {e}")
+
+
 def configure_simulation():
     """Configure simulation parameters interactively."""
     print_step(2, "Configuration")
@@ -418,12 +663,28 @@ def configure_simulation():
     # Get capture file name
     capture_file = get_user_input("Enter capture file name", "dns_capture.pcap")
     
+    # Get capture buffer and snapshot length
+    capture_buffer_mb = get_user_input("Enter capture buffer size in MiB", str(CAPTURE_BUFFER_MB))
+    try:
+        capture_buffer_mb = int(capture_buffer_mb)
+    except ValueError:
+        capture_buffer_mb = CAPTURE_BUFFER_MB
+    
+    snaplen = get_user_input("Enter bytes to capture per packet", str(CAPTURE_SNAPLEN))
+    try:
+        snaplen = int(snaplen)
+    except ValueError:
+        snaplen = CAPTURE_SNAPLEN
+    
     return {
         'target_domain': target_domain,
         'bad_dns': bad_dns,
         'good_dns': good_dns,
         'capture_duration': capture_duration,
-        'capture_file': capture_file
+        'capture_file': capture_file,
+        'staging_file': capture_staging_path(capture_file),
+        'capture_buffer_mb': capture_buffer_mb,
+        'snaplen': snaplen
     }
 
 
@@ -437,30 +698,42 @@ def display_network_info(interface: str, config: Dict):
     if platform.system() == "Windows":
         # Show interface details
         print(f"\n{Colors.BOLD}Interface Details:{Colors.ENDC}")
-        run_command(f"powershell.exe -Command \"Get-NetAdapter -Name '{interface}' | Format-List\"")
+        run_powershell(f"Get-NetAdapter -Name '{interface}' | Format-List")
         
         # Show IP configuration
         print(f"\n{Colors.BOLD}IP Configuration:{Colors.ENDC}")
-        run_command(f"powershell.exe -Command \"Get-NetIPAddress -InterfaceAlias '{interface}' | Format-Table\"")
+        run_powershell(f"Get-NetIPAddress -InterfaceAlias '{interface}' | Format-Table")
         
         # Show DNS configuration
         print(f"\n{Colors.BOLD}DNS Configuration:{Colors.ENDC}")
-        run_command(f"powershell.exe -Command \"Get-DnsClientServerAddress -InterfaceAlias '{interface}' | Format-Table\"")
+        run_powershell(f"Get-DnsClientServerAddress -InterfaceAlias '{interface}' | Format-Table")
     else:
-        # Show interface details
-        print(f"\n{Colors.BOLD}Interface Details:{Colors.ENDC}")
-        run_command(f"ip addr show {interface}")
-        
-        # Show DNS configuration
-        print(f"\n{Colors.BOLD}DNS Configuration:{Colors.ENDC}")
-        run_command("cat /etc/resolv.conf")
-        
-        # Show current DNS servers
-        print(f"\n{Colors.BOLD}Current DNS Servers:{Colors.ENDC}")
-        run_command("resolvectl status")
+        # The probes are independent, so run them together and print the results in order
+        headings = tuple(f"\n{Colors.BOLD}{heading}{Colors.ENDC}"
+                         for heading in ("Interface Details:", "DNS Configuration:", "Current DNS Servers:"))
+        _print_sections(headings, asyncio.run(_gather_info_linux(interface)))
 
 
-def start_wireshark_capture(interface: str, capture_file: str) -> Optional[int]:
+def _wait_for_capture(process: subprocess.Popen, timeout: float = CAPTURE_START_TIMEOUT) -> bool:
+    """Wait until tshark reports it is capturing, then tell whether it is still running."""
+    ready = threading.Event()
+    
+    def drain_stderr():
+        # Keep reading after the readiness line so tshark never blocks on a full pipe
+        for line in process.stderr:
+            if 'Capturing on' in line:
+                ready.set()
+        # stderr closed: tshark is exiting, so reap it before reporting
+        process.wait()
+        ready.set()
+    
+    threading.Thread(target=drain_stderr, daemon=True).start()
+    ready.wait(timeout)
+    return process.poll() is None
+
+
+def start_wireshark_capture(interface: str, capture_file: str, buffer_mb: int = CAPTURE_BUFFER_MB,
+                            snaplen: int = CAPTURE_SNAPLEN) -> Optional[subprocess.Popen]:
     """Start Wireshark capture in background."""
     print_step(4, "Starting Wireshark Capture")
     
@@ -484,24 +757,20 @@ def start_wireshark_capture(interface: str, capture_file: str) -> Optional[int]:
                 print_error("tshark not found. Please install Wireshark.")
                 return None
             
-            # Start tshark in background
-            process = subprocess.Popen(
-                f'"{tshark_path}" -i "{interface}" -w "{capture_file}" -f "port 53"',
-                shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-            )
+            command = [tshark_path]
         else:
-            # Start tshark in background
-            process = subprocess.Popen(
-                f"sudo tshark -i {interface} -w {capture_file} -f 'port 53'",
-                shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-            )
+            command = ["sudo", "tshark"]
         
-        # Wait a moment for capture to start
-        time.sleep(2)
+        # Start tshark in background; -n keeps tshark from making DNS lookups of its own
+        process = subprocess.Popen(
+            command + ["-i", interface, "-w", capture_file,
+                       "-B", str(buffer_mb), "-s", str(snaplen), "-n", "-f", "port 53"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, bufsize=1
+        )
         
-        if process.poll() is None:  # Process is still running
+        if _wait_for_capture(process):  # Process is still running
             print_success("Wireshark capture started successfully")
-            return process.pid
+            return process
         else:
             print_error("Failed to start Wireshark capture")
             return None
@@ -518,11 +787,11 @@ def simulate_dns_failure(interface: str, bad_dns: str):
     print(f"Setting DNS to invalid server: {bad_dns}")
     
     if platform.system() == "Windows":
-        run_command(f'powershell.exe -Command "Set-DnsClientServerAddress -InterfaceAlias \"{interface}\" -ServerAddresses \"{bad_dns}\""')
-        run_command("powershell.exe -Command \"Clear-DnsClientCache\"")
+        run_powershell(f"Set-DnsClientServerAddress -InterfaceAlias '{interface}' -ServerAddresses '{bad_dns}'")
+        run_powershell("Clear-DnsClientCache")
     else:
-        run_command(f"sudo resolvectl dns {interface} {bad_dns}")
-        run_command("sudo resolvectl flush-caches")
+        run_command(["sudo", "resolvectl", "dns", interface, bad_dns])
+        run_command(["sudo", "resolvectl", "flush-caches"])
     
     time.sleep(2)
     print_success("DNS failure simulated")
@@ -532,15 +801,7 @@ def test_dns_failure(target_domain: str):
     """Test DNS resolution (should fail)."""
     print_step(6, "Testing DNS Resolution (Expected to Fail)")
     
-    print(f"Testing ping to {target_domain}...")
-    if platform.system() == "Windows":
-        run_command(f"ping -n 3 {target_domain}")
-        print(f"\nTesting DNS lookup with nslookup...")
-        run_command(f"nslookup {target_domain}")
-    else:
-        run_command(f"ping -c 3 {target_domain}")
-        print(f"\nTesting DNS lookup with dig...")
-        run_command(f"dig {target_domain}")
+    run_dns_probes(target_domain)
     
     print_warning("DNS resolution should be failing now")
 
@@ -552,11 +813,11 @@ def restore_dns(interface: str, good_dns: str):
     print(f"Setting DNS back to working server: {good_dns}")
     
     if platform.system() == "Windows":
-        run_command(f'powershell.exe -Command "Set-DnsClientServerAddress -InterfaceAlias \"{interface}\" -ServerAddresses \"{good_dns}\""')
-        run_command("powershell.exe -Command \"Clear-DnsClientCache\"")
+        run_powershell(f"Set-DnsClientServerAddress -InterfaceAlias '{interface}' -ServerAddresses '{good_dns}'")
+        run_powershell("Clear-DnsClientCache")
     else:
-        run_command(f"sudo resolvectl dns {interface} {good_dns}")
-        run_command("sudo resolvectl flush-caches")
+        run_command(["sudo", "resolvectl", "dns", interface, good_dns])
+        run_command(["sudo", "resolvectl", "flush-caches"])
     
     time.sleep(2)
     print_success("DNS configuration restored")
@@ -566,34 +827,29 @@ def test_dns_recovery(target_domain: str):
     """Test DNS resolution (should work)."""
     print_step(8, "Testing DNS Resolution (Should Work Now)")
     
-    print(f"Testing ping to {target_domain}...")
-    if platform.system() == "Windows":
-        run_command(f"ping -n 3 {target_domain}")
-        print(f"\nTesting DNS lookup with nslookup...")
-        run_command(f"nslookup {target_domain}")
-    else:
-        run_command(f"ping -c 3 {target_domain}")
-        print(f"\nTesting DNS lookup with dig...")
-        run_command(f"dig {target_domain}")
+    run_dns_probes(target_domain)
     
     print_success("DNS resolution should be working now")
 
 
-def stop_wireshark_capture(pid: int, capture_file: str):
+def stop_wireshark_capture(process: subprocess.Popen, capture_file: str, staging_file: Optional[str] = None):
     """Stop Wireshark capture."""
     print_step(9, "Stopping Wireshark Capture")
     
     try:
-        os.kill(pid, signal.SIGTERM)
-        time.sleep(1)
+        process.terminate()
         
-        # Check if process is still running
+        # wait() returns as soon as tshark exits, so the grace period only costs time when it hangs
         try:
-            os.kill(pid, 0)
+            process.wait(timeout=CAPTURE_STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
             print_warning("Process still running, force killing...")
-            os.kill(pid, signal.SIGKILL)
-        except OSError:
-            pass
+            process.kill()
+            process.wait()
+        
+        if staging_file and staging_file != capture_file:
+            # copyfile leaves the final file with normal permissions rather than mkstemp's 0600
+            shutil.move(staging_file, capture_file, copy_function=shutil.copyfile)
         
         print_success("Wireshark capture stopped")
         print(f"Capture saved as: {capture_file}")
@@ -601,6 +857,8 @@ def stop_wireshark_capture(pid: int, capture_file: str):
         
     except Exception as e:
         print_error(f"Error stopping capture: {e}")
+    finally:
+        discard_staging_file(staging_file, capture_file)
 
 
 def display_analysis_tips():
@@ -676,20 +934,24 @@ def main():
     print(f"  Good DNS: {config['good_dns']}")
     print(f"  Capture Duration: {config['capture_duration']} seconds")
     print(f"  Capture File: {config['capture_file']}")
+    print(f"  Capture Buffer: {config['capture_buffer_mb']} MiB")
+    print(f"  Snapshot Length: {config['snaplen']} bytes")
     
     if not confirm_action("Start the DNS troubleshooting simulation?", True):
         print_info("Simulation cancelled by user")
         sys.exit(0)
     
-    wireshark_pid = None
+    wireshark_proc = None
     
     try:
         # Display network info
         display_network_info(interface, config)
         
         # Start Wireshark capture
-        wireshark_pid = start_wireshark_capture(interface, config['capture_file'])
-        if not wireshark_pid:
+        wireshark_proc = start_wireshark_capture(
+            interface, config['staging_file'], config['capture_buffer_mb'], config['snaplen']
+        )
+        if wireshark_proc is None:
             print_error("Failed to start capture, continuing without it...")
         
         # Simulate DNS failure
@@ -709,8 +971,8 @@ def main():
         test_dns_recovery(config['target_domain'])
         
         # Stop capture
-        if wireshark_pid:
-            stop_wireshark_capture(wireshark_pid, config['capture_file'])
+        if wireshark_proc is not None:
+            stop_wireshark_capture(wireshark_proc, config['capture_file'], config['staging_file'])
         
         # Analysis tips
         display_analysis_tips()
@@ -721,19 +983,21 @@ def main():
         
         if confirm_action("Open capture file in Wireshark now?", False):
             if platform.system() == "Windows":
-                run_command(f'start wireshark "{config["capture_file"]}"')
+                # Opens the capture with its registered handler, as 'start' did
+                os.startfile(config["capture_file"])
             else:
-                run_command(f"wireshark {config['capture_file']} &")
+                subprocess.Popen(["wireshark", config['capture_file']],
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         
     except KeyboardInterrupt:
         print_warning("\nSimulation interrupted by user")
-        if wireshark_pid:
+        if wireshark_proc is not None:
             print("Stopping Wireshark capture...")
-            stop_wireshark_capture(wireshark_pid, config['capture_file'])
+            stop_wireshark_capture(wireshark_proc, config['capture_file'], config['staging_file'])
     except Exception as e:
         print_error(f"Unexpected error: {e}")
-        if wireshark_pid:
-            stop_wireshark_capture(wireshark_pid, config['capture_file'])
+        if wireshark_proc is not None:
+            stop_wireshark_capture(wireshark_proc, config['capture_file'], config['staging_file'])
 
 
 if __name__ == "__main__":
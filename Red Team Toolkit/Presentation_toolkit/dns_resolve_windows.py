@@ -5,6 +5,7 @@ A presentation-ready tool for demonstrating DNS troubleshooting with Wireshark i
 """
 
 import os
+import shutil
 import sys
 import subprocess
 import time
@@ -141,7 +142,7 @@ def check_dependencies() -> bool:
                 missing.append(f"{dep} ({description})")
         else:
             # Check if command is available
-            if run_cmd(f"where {dep}", True) is None:
+            if shutil.which(dep) is None:
                 missing.append(f"{dep} ({description})")
     
     if missing: